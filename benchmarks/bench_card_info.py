@@ -0,0 +1,75 @@
+"""Compare the memory of normalized card info as UseCaseInfo records and dicts.
+
+Records are measured as parsed and after every field was escaped for rendering.
+
+Run from the repository root:
+
+    python benchmarks/bench_card_info.py --cards 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from benchmarks.corpus import make_card  # noqa: E402
+
+
+def measure(build):
+    """Bytes allocated by ``build()`` that are still alive afterwards."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cards', type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    front_matter = [
+        yaml.safe_load(make_card(i, rng, body_paragraphs=0).split('---')[1])
+        for i in range(args.cards)
+    ]
+    infos = [main._normalize_use_case_info(data) for data in front_matter]
+
+    # Only the containers are measured; both share the same field values.
+    _, dict_bytes = measure(lambda: [info.as_dict() for info in infos])
+    _, record_bytes = measure(
+        lambda: [main.UseCaseInfo(**info.as_dict()) for info in infos]
+    )
+
+    def rendered_records():
+        # What the card renderers ask of each record.
+        records = [main.UseCaseInfo(**info.as_dict()) for info in infos]
+        for record in records:
+            for field in main.USE_CASE_FIELDS:
+                record.escaped(field)
+        return records
+
+    _, rendered_bytes = measure(rendered_records)
+
+    print(f'{args.cards} synthetic cards')
+    for label, size in [
+        ('dict (previous)', dict_bytes),
+        ('UseCaseInfo (current)', record_bytes),
+        ('UseCaseInfo, rendered', rendered_bytes),
+    ]:
+        print(
+            f'  {label:<24} {size / 2**20:8.1f} MiB'
+            f'  {size / args.cards:8.0f} B/card  x{dict_bytes / size:.2f}'
+        )
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,69 @@
+"""Time the grid and rotator card renderers and size their output per card.
+
+Run from the repository root:
+
+    python benchmarks/bench_card_templates.py --cards 2000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from benchmarks.corpus import write_corpus  # noqa: E402
+
+
+def median_seconds(render, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cards', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=9)
+    args = parser.parse_args(argv)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(os.path.join(tmp, 'docs'), args.cards)
+        os.chdir(tmp)
+        paths = main._card_file_paths('docs/cards')
+        # Parse every card up front; only the rendering is timed.
+        for path in paths:
+            main.CARD_REGISTRY.get(path)
+
+        renderers = {
+            'grid card': main._render_grid_use_case_card,
+            'grid card, sprite': lambda path, i: main._render_grid_use_case_card(
+                path, i, icon_sprite=True
+            ),
+            'rotator card': main._render_featured_rotator_card,
+        }
+        print(f'{args.cards} synthetic cards')
+        for label, renderer in renderers.items():
+            size = sum(len(renderer(path, i)) for i, path in enumerate(paths))
+            seconds = median_seconds(
+                lambda renderer=renderer: [
+                    renderer(path, i) for i, path in enumerate(paths)
+                ],
+                args.rounds,
+            )
+            print(
+                f'  {label:<18} {seconds / args.cards * 1e6:7.1f} us/card'
+                f'  {size / args.cards:7.0f} B/card'
+            )
+        os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    run()
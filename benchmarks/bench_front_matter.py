@@ -0,0 +1,82 @@
+"""Compare the front-matter reader in main.py with the previous split-based path.
+
+Run from the repository root:
+
+    python benchmarks/bench_front_matter.py --cards 10000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from benchmarks.corpus import write_corpus  # noqa: E402
+
+
+def read_with_split(file_path):
+    """The reader main.py used before: whole file, str.split and safe_load."""
+    with open(f'docs/{file_path}', encoding='utf-8') as f:
+        content = f.read()
+    parts = content.split('---', 3)
+    return yaml.safe_load(parts[1]) or {}, parts[2].strip()
+
+
+def read_with_scan(file_path):
+    return main._read_front_matter_from_docs(file_path, with_body=False)
+
+
+def read_with_scan_pure_python(file_path):
+    loader = main.YamlLoader
+    main.YamlLoader = yaml.SafeLoader
+    try:
+        return main._read_front_matter_from_docs(file_path, with_body=False)
+    finally:
+        main.YamlLoader = loader
+
+
+def time_reader(reader, file_paths):
+    start = time.perf_counter()
+    for file_path in file_paths:
+        reader(file_path)
+    return time.perf_counter() - start
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cards', type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    readers = [
+        ('split + yaml.safe_load (previous)', read_with_split),
+        ('line scan + SafeLoader', read_with_scan_pure_python),
+        (f'line scan + {main.YamlLoader.__name__} (current)', read_with_scan),
+    ]
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(os.path.join(tmp, 'docs'), args.cards)
+        os.chdir(tmp)
+        try:
+            file_paths = [f'cards/{name}' for name in sorted(os.listdir('docs/cards'))]
+            baseline = None
+            print(f'{args.cards} synthetic cards')
+            for label, reader in readers:
+                elapsed = time_reader(reader, file_paths)
+                baseline = baseline or elapsed
+                print(
+                    f'  {label:<40} {elapsed:8.3f} s'
+                    f'  {args.cards / elapsed:10.0f} cards/s'
+                    f'  x{baseline / elapsed:.2f}'
+                )
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,60 @@
+"""Time GalleryEntry canonicalization one entry at a time and as a batch.
+
+Needs nomad-lab installed. Run from the repository root:
+
+    python benchmarks/bench_normalize.py --entries 10000
+"""
+
+import argparse
+import random
+import time
+
+from nomad_gallery.schema_packages.schema_package import (
+    GalleryEntry,
+    normalize_gallery_entries,
+)
+
+KEYWORDS = ['DFT', 'dft', 'Batteries', 'batteries', 'ML', 'Catalysis', 'XPS']
+
+
+def make_entries(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        GalleryEntry(
+            name=f'  Entry   {i} ',
+            research_field=' Materials  Science',
+            institution='Test   Institute ',
+            keywords=rng.sample(KEYWORDS, 4),
+            coauthors=['Jane  Doe', 'John Roe '],
+            methodology_type='Computational',
+        )
+        for i in range(count)
+    ]
+
+
+def canonicalize_each(entries):
+    for entry in entries:
+        entry.canonicalize()
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    print(f'{args.entries} synthetic entries')
+    for label, normalize in [
+        ('GalleryEntry.canonicalize per entry', canonicalize_each),
+        ('normalize_gallery_entries', normalize_gallery_entries),
+    ]:
+        entries = make_entries(args.entries)
+        start = time.perf_counter()
+        normalize(entries)
+        elapsed = time.perf_counter() - start
+        print(
+            f'  {label:<40} {elapsed:8.3f} s  {args.entries / elapsed:10.0f} entries/s'
+        )
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,72 @@
+"""Time how long the watched grid takes to follow a card edit.
+
+Compares a full (memoized) render of the sorted grid with applying one change
+to a CardIndex and joining its cards. Run from the repository root:
+
+    python benchmarks/bench_watch.py --cards 10000
+"""
+
+import argparse
+import os
+import queue
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from benchmarks.corpus import make_card, write_corpus  # noqa: E402
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cards', type=int, default=10000)
+    parser.add_argument('--edits', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        cards_dir = Path(write_corpus(os.path.join(tmp, 'docs'), args.cards))
+        os.chdir(tmp)
+        try:
+            start = time.perf_counter()
+            index = main.CardIndex('docs/cards').load(workers=0)
+            print(
+                f'{args.cards} synthetic cards, loaded in '
+                f'{time.perf_counter() - start:.2f} s'
+            )
+
+            start = time.perf_counter()
+            main.render_sorted_cards('docs/cards', workers=0)
+            print(
+                f'  full render of the grid (memoized)  '
+                f'{(time.perf_counter() - start) * 1000:8.1f} ms'
+            )
+
+            rng = random.Random(1)
+            changes = queue.Queue()
+            timings = []
+            for _ in range(args.edits):
+                number = rng.randrange(args.cards)
+                path = cards_dir / f'synthetic_{number:06d}.md'
+                path.write_text(make_card(number, rng), encoding='utf-8')
+                changes.put(str(path))
+                start = time.perf_counter()
+                main._apply_card_changes(index, changes)
+                index.cards()
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            print(
+                f'  edit to updated grid (median)   '
+                f'{timings[len(timings) // 2] * 1000:8.1f} ms'
+            )
+            print(f'  edit to updated grid (max)      {timings[-1] * 1000:8.1f} ms')
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    run()
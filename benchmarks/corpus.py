@@ -0,0 +1,58 @@
+"""Synthetic gallery card corpora for the benchmarks."""
+
+import os
+import random
+
+METHODOLOGIES = ['Computational', 'Experimental', 'Mixed/Hybrid']
+FIELDS = ['Battery Science', 'Catalysis', 'Photovoltaics', 'Materials database']
+COUNTRIES = ['DE', 'FR', 'US', 'JP', 'IT', 'NL']
+KEYWORDS = ['DFT', 'NeXus', 'Perovskite', 'AI', 'MD', 'XRD', 'PLD', 'Workflow']
+
+BODY_PARAGRAPH = (
+    'Synthetic markdown body used to measure how much of the file the loaders '
+    'read. It is never shown on the gallery because the card has a description.'
+)
+
+
+def make_card(index, rng, body_paragraphs=20):
+    keywords = rng.sample(KEYWORDS, rng.randint(1, 6))
+    front_matter = '\n'.join(
+        [
+            '---',
+            f'title: Synthetic use case {index}',
+            f'submitter: Submitter {index % 97}',
+            f'institution: Institute {index % 31}',
+            f'country: {rng.choice(COUNTRIES)}',
+            f'research_field: {rng.choice(FIELDS)}',
+            f'methodology_type: {rng.choice(METHODOLOGIES)}',
+            'technique: DFT, PBE',
+            'coauthors:',
+            '  - Jane Doe',
+            '  - John Roe',
+            f'description: Synthetic card number {index} for the benchmarks.',
+            f'submission_date: 20{rng.randint(20, 25)}-{rng.randint(1, 12):02d}'
+            f'-{rng.randint(1, 28):02d}',
+            f'image_path: assets/synthetic-{index % 5}.png',
+            f'entry_link: https://nomad-lab.eu/prod/v1/gui/entry/{index}',
+            f'repo_link: https://github.com/FAIRmat-NFDI/synthetic-{index}',
+            f'estimated_active_users: {rng.randint(0, 5000)}',
+            f'downloads: {rng.randint(0, 50000)}',
+            'keywords:',
+            *(f'  - {keyword}' for keyword in keywords),
+            '---',
+        ]
+    )
+    body = '\n\n'.join([BODY_PARAGRAPH] * body_paragraphs)
+    return f'{front_matter}\n\n{body}\n'
+
+
+def write_corpus(docs_dir, count, cards_subdir='cards', seed=0):
+    """Write ``count`` synthetic cards to ``docs_dir/cards_subdir``."""
+    rng = random.Random(seed)
+    cards_dir = os.path.join(docs_dir, cards_subdir)
+    os.makedirs(cards_dir, exist_ok=True)
+    for index in range(count):
+        path = os.path.join(cards_dir, f'synthetic_{index:06d}.md')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(make_card(index, rng))
+    return cards_dir
@@ -0,0 +1,238 @@
+"""Benchmark the gallery build pipeline in main.py on synthetic card corpora.
+
+Run from the repository root:
+
+    python benchmarks/gallery_build.py --sizes 100,1000 --output results.json
+    python benchmarks/gallery_build.py --baseline results.json --threshold 0.25
+
+Each stage is timed on its own (best of ``--repeat`` runs) and then re-run
+under tracemalloc to record its peak Python memory. With ``--baseline`` the run
+fails (exit code 1) when a stage got slower, or used more memory, than the
+baseline by more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from benchmarks.corpus import write_corpus  # noqa: E402
+
+DEFAULT_SIZES = (100, 1000, 10000, 50000)
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 3
+# Stages faster than this are too noisy to gate on their timing.
+MIN_COMPARABLE_SECONDS = 0.01
+
+
+def reset_caches():
+    """Start from a cold in-process state without the on-disk card cache."""
+    main.CARD_REGISTRY = main.CardRegistry()
+    main._SERVE_STATE.rendered_cards.clear()
+
+
+def warm_registry(file_paths):
+    reset_caches()
+    for file_path in file_paths:
+        main.CARD_REGISTRY.get(file_path)
+
+
+def load_raw_front_matter(file_paths):
+    return [
+        main._read_front_matter_from_docs(file_path, with_body=False)[0]
+        for file_path in file_paths
+    ]
+
+
+def stage_render_sorted_cards(file_paths):
+    reset_caches()
+    return lambda: main.render_sorted_cards('docs/cards', workers=0)
+
+
+def stage_render_sorted_cards_warm(file_paths):
+    reset_caches()
+    main.render_sorted_cards('docs/cards', workers=0)
+    return lambda: main.render_sorted_cards('docs/cards', workers=0)
+
+
+def stage_write_sorted_cards(file_paths):
+    reset_caches()
+
+    def run():
+        with open(os.devnull, 'w', encoding='utf-8') as stream:
+            main.write_sorted_cards(stream, 'docs/cards', workers=0)
+
+    return run
+
+
+def stage_render_grid_use_case_card(file_paths):
+    warm_registry(file_paths)
+
+    def run():
+        for index, file_path in enumerate(file_paths):
+            main._render_grid_use_case_card(file_path, index)
+
+    return run
+
+
+def stage_render_featured_rotator_card(file_paths):
+    warm_registry(file_paths)
+
+    def run():
+        for index, file_path in enumerate(file_paths):
+            main._render_featured_rotator_card(file_path, index)
+
+    return run
+
+
+def stage_normalize_use_case_info(file_paths):
+    raw = load_raw_front_matter(file_paths)
+
+    def run():
+        for data in raw:
+            main._normalize_use_case_info(data)
+
+    return run
+
+
+STAGES = {
+    'render_sorted_cards': stage_render_sorted_cards,
+    'render_sorted_cards (warm)': stage_render_sorted_cards_warm,
+    'write_sorted_cards': stage_write_sorted_cards,
+    '_render_grid_use_case_card': stage_render_grid_use_case_card,
+    '_render_featured_rotator_card': stage_render_featured_rotator_card,
+    '_normalize_use_case_info': stage_normalize_use_case_info,
+}
+
+
+def measure(stage, file_paths, memory=True, repeat=DEFAULT_REPEAT):
+    timings = []
+    for _ in range(repeat):
+        run = stage(file_paths)
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    seconds = min(timings)
+
+    peak_bytes = None
+    if memory:
+        run = stage(file_paths)
+        tracemalloc.start()
+        try:
+            run()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'seconds': seconds,
+        'cards_per_second': len(file_paths) / seconds if seconds else None,
+        'peak_bytes': peak_bytes,
+    }
+
+
+def run_size(size, memory=True, repeat=DEFAULT_REPEAT):
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(os.path.join(tmp, 'docs'), size)
+        os.chdir(tmp)
+        try:
+            file_paths = [f'cards/{name}' for name in sorted(os.listdir('docs/cards'))]
+            return {
+                name: measure(stage, file_paths, memory, repeat)
+                for name, stage in STAGES.items()
+            }
+        finally:
+            os.chdir(cwd)
+            reset_caches()
+
+
+def find_regressions(results, baseline, threshold):
+    regressions = []
+    for size, stages in results.items():
+        for name, current in stages.items():
+            previous = baseline.get(size, {}).get(name)
+            if not previous:
+                continue
+            for metric in ('seconds', 'peak_bytes'):
+                before, after = previous.get(metric), current.get(metric)
+                if metric == 'seconds' and (before or 0) < MIN_COMPARABLE_SECONDS:
+                    continue
+                if before and after and after > before * (1 + threshold):
+                    regressions.append(
+                        f'{size} cards, {name}: {metric} {before:.4g} -> {after:.4g}'
+                        f' (+{after / before - 1:.0%})'
+                    )
+    return regressions
+
+
+def print_table(results):
+    print(f'{"cards":>7}  {"stage":<32} {"seconds":>9} {"cards/s":>11} {"peak MiB":>9}')
+    for size, stages in results.items():
+        for name, result in stages.items():
+            peak = result['peak_bytes']
+            peak_text = f'{peak / 2**20:9.1f}' if peak is not None else f'{"-":>9}'
+            print(
+                f'{size:>7}  {name:<32} {result["seconds"]:9.3f}'
+                f' {result["cards_per_second"] or 0:11.0f} {peak_text}'
+            )
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--sizes',
+        default=','.join(str(size) for size in DEFAULT_SIZES),
+        help='Comma-separated corpus sizes.',
+    )
+    parser.add_argument('--output', help='Write the results to this JSON file.')
+    parser.add_argument('--baseline', help='Compare against this results JSON.')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=DEFAULT_REPEAT,
+        help='Time each stage this many times and keep the fastest run.',
+    )
+    parser.add_argument(
+        '--no-memory', action='store_true', help='Skip the tracemalloc pass.'
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    results = {}
+    for size in sizes:
+        results[str(size)] = run_size(
+            size, memory=not args.no_memory, repeat=max(1, args.repeat)
+        )
+
+    print(f'libyaml: {main.YamlLoader is not yaml.SafeLoader}')
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f'Regressions beyond {args.threshold:.0%}:')
+            for regression in regressions:
+                print(f'  {regression}')
+            return 1
+        print(f'No regressions beyond {args.threshold:.0%}.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
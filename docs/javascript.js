@@ -19,6 +19,16 @@
 
     let activeFilter = "methodology";
     let sortOrder = "desc"; // desc = newest first
+    let searchIndex = null; // build-time index, see build_search_index in main.py
+    let facets = null; // build-time facet counts, see build_facets in main.py
+
+    // Facet names of build_facets -> filter state keys
+    const facetStateKeys = {
+      methodology: "methodology",
+      research_field: "field",
+      country: "country",
+      keywords: "keywords"
+    };
 
     const state = {
       methodology: "All",
@@ -45,7 +55,33 @@
       return Array.from(new Set(values.filter(Boolean))).sort((a, b) => a.localeCompare(b));
     }
 
+    function getOptionsFromIndex() {
+      const { fields, keywords } = searchIndex;
+      const values = (field) => uniqueSorted(fields[field].map((v) => v.trim()));
+
+      return {
+        methodologies: values("methodology"),
+        fields: values("research_field"),
+        countries: values("country"),
+        keywords: uniqueSorted(keywords)
+      };
+    }
+
+    // Keywords come most common first; the select options stay alphabetical
+    function getOptionsFromFacets() {
+      const values = (facet) => uniqueSorted(facets.facets[facet].values);
+
+      return {
+        methodologies: values("methodology"),
+        fields: values("research_field"),
+        countries: values("country"),
+        keywords: facets.facets.keywords.values
+      };
+    }
+
     function getOptionsFromCards() {
+      if (facets) return getOptionsFromFacets();
+      if (searchIndex) return getOptionsFromIndex();
       const cards = getCards();
 
       const methodologies = uniqueSorted(
@@ -72,9 +108,20 @@
       return { methodologies, fields, countries, keywords };
     }
 
+    // Keywords seen together with the typed keyword, most frequent first
+    function relatedKeywords() {
+      if (!facets || !state.keywords) return [];
+      const { values } = facets.facets.keywords;
+      const position = values.findIndex((k) => norm(k) === norm(state.keywords));
+      if (position < 0) return [];
+      return facets.related[position].map(([other]) => values[other]);
+    }
+
     function buildKeywordSuggestions() {
       if (!keywordDatalist) return;
-      const { keywords } = getOptionsFromCards();
+      const keywords = Array.from(
+        new Set([...relatedKeywords(), ...getOptionsFromCards().keywords])
+      );
       keywordDatalist.innerHTML = keywords
         .map((k) => `<option value="${k.replace(/"/g, "&quot;")}"></option>`)
         .join("");
@@ -167,6 +214,7 @@
       } else {
         control = renderKeywordInput(state.keywords, (e) => {
           state.keywords = e.target.value;
+          buildKeywordSuggestions();
           refresh();
         });
       }
@@ -199,6 +247,39 @@
       return true;
     }
 
+    // Ids of the indexed cards matching the current state
+    function matchingIdsFromIndex() {
+      const { fields, cards, keywords, postings } = searchIndex;
+
+      // Per field, which value codes pass (null = no constraint)
+      const accepted = (field, value) =>
+        value === "All" ? null : fields[field].map((v) => norm(v) === norm(value));
+      const constraints = [
+        ["methodology", accepted("methodology", state.methodology)],
+        ["research_field", accepted("research_field", state.field)],
+        ["country", accepted("country", state.country)]
+      ].filter(([, codes]) => codes);
+
+      let keywordHits = null;
+      if (state.keywords) {
+        const query = norm(state.keywords);
+        keywordHits = new Set();
+        keywords.forEach((keyword, i) => {
+          if (norm(keyword).includes(query)) {
+            postings[i].forEach((position) => keywordHits.add(position));
+          }
+        });
+      }
+
+      const ids = new Set();
+      cards.ids.forEach((id, position) => {
+        if (constraints.some(([field, codes]) => !codes[cards[field][position]])) return;
+        if (keywordHits && !keywordHits.has(position)) return;
+        ids.add(id);
+      });
+      return ids;
+    }
+
     function applySort() {
       const cards = getCards();
 
@@ -215,6 +296,17 @@
       const cards = getCards();
       let visible = 0;
 
+      if (searchIndex) {
+        const ids = matchingIdsFromIndex();
+        cards.forEach((card) => {
+          card.style.display = ids.has(card.id) ? "" : "none";
+        });
+        if (countEl) {
+          countEl.textContent = `${ids.size} of ${searchIndex.count}`;
+        }
+        return;
+      }
+
       cards.forEach((card) => {
         const show = matches(card);
         card.style.display = show ? "" : "none";
@@ -226,7 +318,21 @@
       }
     }
 
+    function isFiltering() {
+      return (
+        sortOrder !== "desc" ||
+        state.methodology !== "All" ||
+        state.field !== "All" ||
+        state.country !== "All" ||
+        Boolean(state.keywords)
+      );
+    }
+
     function refresh() {
+      // Filtering and re-sorting need every card, not just the loaded shards
+      if (isFiltering()) {
+        document.dispatchEvent(new CustomEvent("gallery:load-all"));
+      }
       applySort();
       applyFilters();
     }
@@ -268,9 +374,60 @@
 
     clearBtn?.addEventListener("click", clearAll);
 
+    // Facet chips rendered by render_facet_chips in main.py
+    filterRoot.querySelectorAll(".gallery-facets__chip").forEach((chip) => {
+      chip.addEventListener("click", () => {
+        const key = facetStateKeys[chip.dataset.facet];
+        if (!key) return;
+        state[key] = chip.dataset.value || "";
+        setActiveChip(key);
+        buildKeywordSuggestions();
+        refresh();
+      });
+    });
+
+    document.addEventListener("gallery:cards-added", () => {
+      if (!document.body.contains(container)) return;
+      buildKeywordSuggestions();
+      // Keep the keyword input (and its focus) while the user is typing
+      if (activeFilter !== "keywords") renderControlRow();
+      refresh();
+    });
+
     buildKeywordSuggestions();
     setActiveChip("methodology");
     refresh();
+
+    // Until the index arrives (or if it cannot be fetched) the filter reads
+    // the cards' data-* attributes.
+    if (filterRoot.dataset.searchIndex) {
+      fetch(filterRoot.dataset.searchIndex)
+        .then((response) => {
+          if (!response.ok) throw new Error(`${response.url}: ${response.status}`);
+          return response.json();
+        })
+        .then((index) => {
+          searchIndex = index;
+          buildKeywordSuggestions();
+          if (activeFilter !== "keywords") renderControlRow();
+          refresh();
+        })
+        .catch((error) => console.error("Could not load the gallery index", error));
+    }
+
+    if (filterRoot.dataset.facets) {
+      fetch(filterRoot.dataset.facets)
+        .then((response) => {
+          if (!response.ok) throw new Error(`${response.url}: ${response.status}`);
+          return response.json();
+        })
+        .then((data) => {
+          facets = data;
+          buildKeywordSuggestions();
+          if (activeFilter !== "keywords") renderControlRow();
+        })
+        .catch((error) => console.error("Could not load the gallery facets", error));
+    }
   }
 
   if (typeof window.document$ !== "undefined" && window.document$?.subscribe) {
@@ -286,6 +443,78 @@
   }
 })();
 
+/* =========================================================
+   Gallery shards ("Load more")
+   ========================================================= */
+(function () {
+  function initGalleryShards() {
+    const container = document.getElementById("galleryCards");
+    const loader = document.querySelector(".gallery-shard-loader");
+
+    if (!container || !loader) return;
+    if (loader.dataset.shardInit === "true") return;
+    loader.dataset.shardInit = "true";
+
+    const button = loader.querySelector(".gallery-shard-loader__button");
+    const pending = JSON.parse(loader.dataset.shardUrls || "[]");
+    let loading = null;
+
+    function loadNext() {
+      if (loading) return loading;
+      const url = pending.shift();
+      if (!url) return Promise.resolve();
+
+      loading = fetch(url)
+        .then((response) => {
+          if (!response.ok) throw new Error(`${url}: ${response.status}`);
+          return response.text();
+        })
+        .then((html) => {
+          container.insertAdjacentHTML("beforeend", html);
+          document.dispatchEvent(new CustomEvent("gallery:cards-added"));
+        })
+        .catch((error) => {
+          pending.unshift(url);
+          console.error("Could not load gallery cards", error);
+          throw error;
+        })
+        .finally(() => {
+          loading = null;
+          loader.hidden = pending.length === 0;
+        });
+      return loading;
+    }
+
+    async function loadAll() {
+      while (pending.length || loading) {
+        await loadNext();
+      }
+    }
+
+    function onLoadAll() {
+      if (!document.body.contains(loader)) return;
+      loadAll().catch(() => {});
+    }
+
+    button?.addEventListener("click", () => {
+      loadNext().catch(() => {});
+    });
+    document.addEventListener("gallery:load-all", onLoadAll);
+  }
+
+  if (typeof window.document$ !== "undefined" && window.document$?.subscribe) {
+    window.document$.subscribe(() => {
+      initGalleryShards();
+    });
+  }
+
+  if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", initGalleryShards);
+  } else {
+    initGalleryShards();
+  }
+})();
+
 /* =========================================================
    Featured rotator (track-based version)
    ========================================================= */
@@ -450,6 +679,25 @@
         const expanded = card.classList.toggle("is-expanded");
         button.setAttribute("aria-expanded", expanded ? "true" : "false");
 
+        // Lazily rendered cards fetch their details on the first expand
+        const details = card.querySelector(".grid-use-case-card__expanded[data-details-url]");
+        if (expanded && details) {
+          const url = details.dataset.detailsUrl;
+          details.removeAttribute("data-details-url");
+          fetch(url)
+            .then((response) => {
+              if (!response.ok) throw new Error(`${url}: ${response.status}`);
+              return response.text();
+            })
+            .then((html) => {
+              details.innerHTML = html;
+            })
+            .catch((error) => {
+              details.dataset.detailsUrl = url;
+              console.error("Could not load the card details", error);
+            });
+        }
+
         // Collapse every other expanded card in the same grid
         if (expanded) {
           grid.querySelectorAll(".grid-use-case-card.is-expanded").forEach((other) => {
@@ -540,6 +788,8 @@
     });
   }
 
+  document.addEventListener("gallery:cards-added", initGridUseCaseCards);
+
   if (document.readyState === "loading") {
     document.addEventListener("DOMContentLoaded", initGridUseCaseCards);
   } else {
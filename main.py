@@ -1,18 +1,161 @@
+import argparse
+import ast
+import bisect
+import contextlib
+import functools
+import gzip
+import hashlib
+import heapq
 import html
+import inspect
+import io
+import itertools
+import json
 import os
-from datetime import datetime
+import queue
+import re
+import shutil
+import string
+import sys
+import threading
+import time
+import types
+import urllib.parse
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime
 from pathlib import Path
+from xml.etree import ElementTree
 
 import yaml
 
-MIN_FRONT_MATTER_PARTS = 3
+try:
+    from yaml import CSafeDumper as YamlDumper
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as YamlDumper
+    from yaml import SafeLoader as YamlLoader
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; card images are then cached unresized
+    Image = None
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gallery_compress then only writes .gz
+    brotli = None
+
+try:
+    from watchdog.observers import Observer
+except ImportError:  # watchdog comes with MkDocs; only gallery_watch needs it
+    Observer = None
+
+FRONT_MATTER_DELIMITER = "---"
 MAX_SHOWN_KEYWORDS = 4
 
+# Bump when the layout of the on-disk card cache changes. Edits to the parsing
+# and normalization functions and to the field tables they use invalidate the
+# cache on their own (see _card_cache_fingerprint).
+CARD_CACHE_SCHEMA = 2
+CARD_CACHE_PATH = os.environ.get(
+    "NOMAD_GALLERY_CARD_CACHE", ".cache/nomad-gallery/card-info.json"
+)
+
+# Number of worker processes used to parse cards; 0 or 1 keeps loading serial.
+# NOMAD_GALLERY_WORKERS takes precedence over `extra.gallery_workers` in
+# mkdocs.yml.
+CARD_WORKERS_ENV = "NOMAD_GALLERY_WORKERS"
+
+# With NOMAD_GALLERY_WATCH=1 (or `extra.gallery_watch`) the Explore grid is kept
+# in memory between `mkdocs serve` rebuilds and only edited cards are re-read
+# (see watched_card_index).
+WATCH_ENV = "NOMAD_GALLERY_WATCH"
+
+# Cards per page shard of the Explore grid (`extra.gallery_shard_size`); 0 keeps
+# every card in the page. Later shards are fetched from CARD_SHARD_DIR.
+CARD_SHARD_DIR = "gallery-shards"
+
+# Card fields of the search index, matching the grid cards' data-* attributes.
+SEARCH_INDEX_FIELDS = ("methodology", "research_field", "country")
+SEARCH_INDEX_VERSION = 1
+SEARCH_INDEX_DIR = "gallery-index"
+FACET_FIELDS = (*SEARCH_INDEX_FIELDS, "keywords")
+FACETS_VERSION = 1
+# Related keywords kept per keyword; all pairs would grow quadratically.
+FACET_RELATED_LIMIT = 10
+
+# Prebuilt grid and rotator fragments written by `python main.py build-cards`
+# (`extra.gallery_fragments_dir`); the macros include them while they match
+# the cards on disk and fall back to rendering otherwise.
+FRAGMENTS_DIR = ".cache/nomad-gallery/fragments"
+FRAGMENTS_MANIFEST = "manifest.json"
+ROTATOR_CALL = re.compile(
+    r"render_featured_rotator_card\(\s*[\"']([^\"']+)[\"']"
+    r"(?:\s*,\s*(?:index\s*=\s*)?(\d+))?"
+)
+ROTATOR_SLIDES_CALL = re.compile(
+    r"render_featured_rotator_slides\(\s*[\"']([^\"']+)[\"']"
+    r"(?:\s*,\s*(?:k\s*=\s*)?(\d+))?"
+    r"(?:\s*,\s*(?:by\s*=\s*)?[\"'](\w+)[\"'])?"
+    r"(?:\s*,\s*pinned\s*=\s*[\"']([^\"']+)[\"'])?"
+)
+
+# With `extra.gallery_lazy_details` the expanded part of each grid card is
+# written to DETAILS_DIR/<cards dir>/<slug>.html and fetched when the card is
+# first expanded. Slugs are only unique within one cards directory.
+DETAILS_DIR = "gallery-details"
+
+# Card images are optionally (`extra.gallery_image_cache`) downloaded once into
+# a content-addressed cache, resized to WebP thumbnails when Pillow is
+# available and served from IMAGE_SITE_DIR instead of being hot-linked.
+IMAGE_CACHE_PATH = os.environ.get(
+    "NOMAD_GALLERY_IMAGE_CACHE", ".cache/nomad-gallery/images"
+)
+IMAGE_SITE_DIR = "gallery-images"
+IMAGE_WIDTHS = {"hero": 1200, "rotator": 800}
+IMAGE_FETCH_THREADS = 8
+IMAGE_FETCH_TIMEOUT = 30
+
+# With `extra.gallery_compress` the build writes .gz (and, with the brotli
+# package, .br) siblings of the site's text files for hosts that serve
+# precompressed files. Compressed copies are cached by content hash in
+# COMPRESS_CACHE_PATH, so files that did not change are not compressed again.
+COMPRESS_CACHE_PATH = ".cache/nomad-gallery/compressed"
+COMPRESS_SUFFIXES = (".html", ".json", ".js", ".css", ".svg", ".xml", ".txt")
+COMPRESS_MIN_SIZE = 1024
+
+# Files produced while rendering pages, keyed by path relative to the site
+# directory; on_post_build writes them next to the built pages. Path values
+# are copied from the given file.
+GENERATED_FILES = {}
+
+# mkdocs-macros re-executes main.py on every `mkdocs serve` rebuild. In-memory
+# caches that should outlive those reloads hang off this module object, which
+# stays in sys.modules for the lifetime of the process; they are reset whenever
+# main.py itself is edited.
+_SERVE_STATE = sys.modules.setdefault(
+    "_nomad_gallery_serve_state", types.ModuleType("_nomad_gallery_serve_state")
+)
+_SOURCE_DIGEST = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+if getattr(_SERVE_STATE, "source_digest", None) != _SOURCE_DIGEST:
+    for observer, _ in getattr(_SERVE_STATE, "card_watchers", {}).values():
+        observer.stop()
+    _SERVE_STATE.source_digest = _SOURCE_DIGEST
+    _SERVE_STATE.card_infos = {}
+    _SERVE_STATE.rendered_cards = {}
+    _SERVE_STATE.rendered_card_keys = {}
+    _SERVE_STATE.card_indexes = {}
+    _SERVE_STATE.card_watchers = {}
+
 
 def esc(x):
     """HTML-escape any value safely."""
     return html.escape("" if x is None else str(x), quote=True)
 
+# Stands in for the gradient of the cards CardIndex moves around. Card values
+# are HTML-escaped, so they cannot contain it.
+GRADIENT_SLOT = '<"gradient">'
 CARD_GRADIENTS = [
     "linear-gradient(135deg, #a8c8f0 0%, #7baad8 50%, #5a92c6 100%)",
     "linear-gradient(135deg, #b0d0f4 0%, #85b5e0 50%, #6a9ed0 100%)",
@@ -22,21 +165,147 @@ CARD_GRADIENTS = [
 ]
 
 
-def _read_front_matter_from_docs(file_path):
-    """Read YAML front matter from docs/<file_path> safely."""
+def _read_front_matter_from_docs(file_path, with_body=True):
+    """Read YAML front matter from docs/<file_path> safely.
+
+    The file is scanned line by line up to the closing ``---``; the markdown
+    body after it is only read when ``with_body`` is set (otherwise "").
+    ``with_body`` may also be a function deciding it from the front matter.
+    """
     with open(f"docs/{file_path}", encoding="utf-8") as f:
-        content = f.read()
+        if f.readline().rstrip() != FRONT_MATTER_DELIMITER:
+            raise ValueError(f"{file_path} does not start with YAML front matter.")
+
+        lines = []
+        for line in f:
+            if line.rstrip() == FRONT_MATTER_DELIMITER:
+                break
+            lines.append(line)
+        else:
+            raise ValueError(f"{file_path} has invalid YAML front matter.")
+
+        data = _parse_front_matter("".join(lines))
+        if callable(with_body):
+            with_body = with_body(data)
+        body = f.read().strip() if with_body else ""
+
+    return data, body
+
+
+def _parse_front_matter(text):
+    """Parse the YAML between the front matter delimiters."""
+    return yaml.load(text, Loader=YamlLoader) or {}
+
+
+def _read_card_info(file_path):
+    """Read and normalize one card, reading its body only as a description."""
+    data, body = _read_front_matter_from_docs(
+        file_path,
+        with_body=lambda data: not (data.get("description") or data.get("summary")),
+    )
+    return _normalize_use_case_info(data, body)
+
+
+def _date_ordinal(value):
+    """Proleptic ordinal of a card date for sorting; 0 when it is unknown."""
+    if isinstance(value, date):  # datetime is a date as well
+        return value.toordinal()
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d").toordinal()
+    except ValueError:
+        return 0
+
+
+# Front matter keys each UseCaseInfo field is read from, in order of
+# precedence. They are GalleryEntry quantities (under CARD_FIELD_ALIASES) or
+# CARD_ONLY_FIELDS, which tests/test_main.py checks.
+USE_CASE_SOURCES = {
+    "title": ("title",),
+    "submitter": ("submitter", "submitted_by"),
+    "description": ("description", "summary"),
+    "submission_date": ("submission_date", "submitted_date"),
+    "submission_ordinal": ("submission_date", "submitted_date"),
+    "institution": ("institution",),
+    "country": ("country",),
+    "research_field": ("research_field",),
+    "methodology": ("methodology_type",),
+    "technique": ("technique", "specific_technique"),
+    "data_size": ("data_size",),
+    "active_users": ("estimated_active_users",),
+    "downloads": ("downloads",),
+    "media_url": ("media_url",),
+    "coauthors": ("coauthors",),
+    "keywords": ("keywords",),
+    "publication": ("publication_reference",),
+    "funding": ("funding_reference",),
+    "dataset_reference": ("dataset_reference",),
+    "image_name": ("image_name", "title"),
+    "image_path": ("image_path", "image"),
+    "repo_link": ("repo_link", "repository_reference"),
+    "repo_name": ("repo_name", "repo_link", "repository_reference"),
+    "entry_link": ("entry_link", "external_url"),
+    "entry_name": ("entry_name", "entry_link", "external_url"),
+}
+USE_CASE_FIELDS = tuple(USE_CASE_SOURCES)
+# Fields that are their single front matter value, stripped.
+_STRIPPED_FIELDS = (
+    "institution",
+    "country",
+    "research_field",
+    "methodology",
+    "data_size",
+    "media_url",
+    "publication",
+    "funding",
+    "dataset_reference",
+)
+
+
+class UseCaseInfo:
+    """Normalized metadata of one card, see _normalize_use_case_info.
+
+    A slotted record, as every card's info stays in memory during a build.
+    Fields are attributes; ``info["title"]`` works as well. ``escaped``
+    returns the HTML-escaped value of a field; it is not kept, so a record
+    does not grow when its card is rendered.
+    """
+
+    __slots__ = USE_CASE_FIELDS
+
+    def __init__(self, **fields):
+        for name in USE_CASE_FIELDS:
+            setattr(self, name, fields[name])
 
-    if not content.startswith("---"):
-        raise ValueError(f"{file_path} does not start with YAML front matter.")
+    @classmethod
+    def from_dict(cls, fields):
+        return cls(**fields)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in USE_CASE_FIELDS}
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
 
-    parts = content.split("---", MIN_FRONT_MATTER_PARTS)
-    if len(parts) < MIN_FRONT_MATTER_PARTS:
-        raise ValueError(f"{file_path} has invalid YAML front matter.")
+    def escaped(self, name):
+        """The HTML-escaped value of a field."""
+        return esc(getattr(self, name))
 
-    metadata = yaml.safe_load(parts[1]) or {}
-    body = parts[2].strip()
-    return metadata, body
+    def __eq__(self, other):
+        if not isinstance(other, UseCaseInfo):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"UseCaseInfo(**{self.as_dict()!r})"
+
+    def __reduce__(self):
+        # Pickled as the plain fields, e.g. for worker processes.
+        return UseCaseInfo.from_dict, (self.as_dict(),)
 
 
 def _normalize_use_case_info(data, body=""):
@@ -63,402 +332,758 @@ def _normalize_use_case_info(data, body=""):
         data.get("entry_link") or data.get("external_url") or ""
     ).strip()
 
-    return {
-        "title": data.get("title", "Untitled Submission"),
-        "submitter": (
+    submission_date = (
+        data.get("submission_date") or data.get("submitted_date") or ""
+    )
+
+    return UseCaseInfo(
+        title=data.get("title", "Untitled Submission"),
+        submitter=(
             data.get("submitter") or data.get("submitted_by") or "Unknown Submitter"
         ),
-        "description": data.get("description")
+        description=data.get("description")
         or data.get("summary")
         or body
         or "No description available.",
-        "submission_date": data.get("submission_date")
-        or data.get("submitted_date")
-        or "",
-        "institution": (data.get("institution", "") or "").strip(),
-        "country": (data.get("country", "") or "").strip(),
-        "research_field": (data.get("research_field", "") or "").strip(),
-        "methodology": (data.get("methodology_type", "") or "").strip(),
-        "technique": (
+        submission_date=submission_date,
+        submission_ordinal=_date_ordinal(submission_date),
+        technique=(
             data.get("technique") or data.get("specific_technique") or ""
         ).strip(),
-        "data_size": (data.get("data_size", "") or "").strip(),
-        "active_users": data.get("estimated_active_users", None),
-        "downloads": data.get("downloads", None),
-        "media_url": (data.get("media_url", "") or "").strip(),
-        "coauthors": coauthors,
-        "keywords": keywords,
-        "publication": (data.get("publication_reference", "") or "").strip(),
-        "funding": (data.get("funding_reference", "") or "").strip(),
-        "dataset_reference": (data.get("dataset_reference", "") or "").strip(),
-        "image_name": data.get("image_name", data.get("title", "Image")),
-        "image_path": image_path,
-        "repo_link": repo_link,
-        "repo_name": (data.get("repo_name", "") or "").strip() or repo_link,
-        "entry_link": entry_link,
-        "entry_name": (data.get("entry_name", "") or "").strip() or entry_link,
-    }
-
-def _icon_calendar():
-    return (
-        '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor"'
-        ' stroke-width="2" aria-hidden="true">\n'
-        '      <rect x="3" y="4" width="18" height="18" rx="2" ry="2"></rect>\n'
-        '      <line x1="16" y1="2" x2="16" y2="6"></line>\n'
-        '      <line x1="8" y1="2" x2="8" y2="6"></line>\n'
-        '      <line x1="3" y1="10" x2="21" y2="10"></line>\n'
-        '    </svg>'
+        active_users=data.get("estimated_active_users", None),
+        downloads=data.get("downloads", None),
+        coauthors=coauthors,
+        keywords=keywords,
+        image_name=data.get("image_name", data.get("title", "Image")),
+        image_path=image_path,
+        repo_link=repo_link,
+        repo_name=(data.get("repo_name", "") or "").strip() or repo_link,
+        entry_link=entry_link,
+        entry_name=(data.get("entry_name", "") or "").strip() or entry_link,
+        **{
+            field: (data.get(USE_CASE_SOURCES[field][0], "") or "").strip()
+            for field in _STRIPPED_FIELDS
+        },
     )
 
 
-def _icon_chevron_down():
-    return (
-        '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor"'
-        ' stroke-width="2" aria-hidden="true">\n'
-        '      <polyline points="6 9 12 15 18 9"></polyline>\n'
-        '    </svg>'
-    )
+@functools.cache
+def _card_cache_fingerprint():
+    """Identify the cache schema together with the code that produced it."""
+    digest = hashlib.sha256(str(CARD_CACHE_SCHEMA).encode())
+    for table in (USE_CASE_SOURCES, _STRIPPED_FIELDS, UseCaseInfo.__slots__):
+        digest.update(repr(table).encode("utf-8"))
+    for func in (
+        _read_front_matter_from_docs,
+        _parse_front_matter,
+        _read_card_info,
+        _normalize_use_case_info,
+        _date_ordinal,
+    ):
+        try:
+            digest.update(inspect.getsource(func).encode("utf-8"))
+        except (OSError, TypeError):
+            digest.update(func.__code__.co_code)
+    return digest.hexdigest()
 
 
-def _icon_nomad():
-    return (
-        '<img src="assets/images/page/nomad-logo.png" alt="NOMAD" aria-hidden="true">'
-    )
+def _file_digest(full_path):
+    with open(full_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
 
 
-def _icon_document():
-    return (
-        '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor"'
-        ' stroke-width="2" aria-hidden="true">\n'
-        '      <path d="M13 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12'
-        'a2 2 0 0 0 2-2V9z"></path>\n'
-        '      <polyline points="13 2 13 9 20 9"></polyline>\n'
-        '      <line x1="8" y1="13" x2="16" y2="13"></line>\n'
-        '      <line x1="8" y1="17" x2="16" y2="17"></line>\n'
-        '    </svg>'
-    )
-
-
-def _icon_github():
-    _gh_path = (
-        "M12 0C5.373 0 0 5.373 0 12c0 5.302 3.438 9.8 8.207 11.387"
-        ".599.111.793-.261.793-.577v-2.234c-3.338.726-4.033-1.416"
-        "-4.033-1.416-.546-1.387-1.333-1.756-1.333-1.756-1.089-.745"
-        ".083-.729.083-.729 1.205.084 1.839 1.237 1.839 1.237 1.07"
-        " 1.834 2.807 1.304 3.492.997.107-.775.418-1.305.762-1.604"
-        "-2.665-.305-5.467-1.334-5.467-5.931 0-1.311.469-2.381"
-        " 1.236-3.221-.124-.303-.535-1.524.117-3.176 0 0 1.008-.322"
-        " 3.301 1.23A11.48 11.48 0 0 1 12 6.844c1.02.005 2.047.138"
-        " 3.006.404 2.291-1.552 3.297-1.23 3.297-1.23.653 1.653.242"
-        " 2.874.118 3.176.77.84 1.235 1.911 1.235 3.221 0 4.609"
-        "-2.807 5.624-5.479 5.921.43.372.823 1.102.823 2.222v3.293"
-        "c0 .319.192.694.801.576C20.566 21.799 24 17.302 24 12"
-        " 24 5.373 18.627 0 12 0z"
-    )
-    return (
-        '<svg viewBox="0 0 24 24" fill="currentColor" aria-hidden="true">\n'
-        f'      <path d="{_gh_path}"></path>\n'
-        '    </svg>'
-    )
+def _encode_cached_value(value):
+    """JSON hook keeping YAML dates round-trippable through the cache."""
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"{type(value).__name__} is not cacheable")
 
 
-def _icon_play():
-    return """
-    <svg viewBox="0 0 24 24" fill="currentColor" aria-hidden="true">
-      <polygon points="5 3 19 12 5 21 5 3"></polygon>
-    </svg>
+def _decode_cached_value(obj):
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__date__" in obj:
+        return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+class CardCache:
+    """Persistent on-disk cache of normalized card info shared between builds.
+
+    Entries are keyed by docs-relative path and validated against the file's
+    mtime and size, falling back to a content hash when those changed (e.g. on
+    a fresh CI checkout). An unreadable cache file, or one written by another
+    schema/normalization version, is ignored and rebuilt from scratch.
     """
 
+    def __init__(self, path=CARD_CACHE_PATH):
+        self.path = path
+        self._entries = None
+        self._dirty = False
 
-def _icon_users():
-    return (
-        '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor"'
-        ' stroke-width="2" aria-hidden="true">\n'
-        '      <path d="M17 21v-2a4 4 0 0 0-4-4H5a4 4 0 0 0-4 4v2"></path>\n'
-        '      <circle cx="9" cy="7" r="4"></circle>\n'
-        '      <path d="M23 21v-2a4 4 0 0 0-3-3.87"></path>\n'
-        '      <path d="M16 3.13a4 4 0 0 1 0 7.75"></path>\n'
-        '    </svg>'
-    )
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
 
+        self._entries = {}
+        if not self.path or not os.path.exists(self.path):
+            return self._entries
 
-def _icon_download():
-    return (
-        '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor"'
-        ' stroke-width="2" aria-hidden="true">\n'
-        '      <path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path>\n'
-        '      <polyline points="7 10 12 15 17 10"></polyline>\n'
-        '      <line x1="12" y1="15" x2="12" y2="3"></line>\n'
-        '    </svg>'
-    )
-def render_sorted_cards(cards_dir="docs/cards"):
-    """Render all cards from the specified directory, sorted by submission date."""
-    card_files = []
-
-    if os.path.exists(cards_dir):
-        for filename in os.listdir(cards_dir):
-            if filename.endswith(".md"):
-                file_path = os.path.join(cards_dir, filename)
-
-                with open(file_path, encoding="utf-8") as f:
-                    try:
-                        front_matter = yaml.safe_load(f.read().split("---")[1])
-                        submission_date = front_matter.get("submission_date", "")
-
-                        if isinstance(submission_date, str):
-                            try:
-                                date_obj = datetime.strptime(
-                                    submission_date, "%Y-%m-%d"
-                                )
-                            except ValueError:
-                                date_obj = datetime.min
-                        else:
-                            date_obj = (
-                                submission_date
-                                if isinstance(submission_date, datetime)
-                                else datetime.min
-                            )
-
-                        card_files.append((file_path, date_obj))
-                    except Exception as e:
-                        print(f"Error parsing {filename}: {e}")
-
-    card_files.sort(key=lambda x: x[1] if x[1] else datetime.min, reverse=True)
-
-    rendered_cards = ""
-    docs_dir = Path("docs").resolve()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                payload = json.load(f, object_hook=_decode_cached_value)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable card cache {self.path}: {e}")
+            return self._entries
+
+        if (
+            isinstance(payload, dict)
+            and payload.get("fingerprint") == _card_cache_fingerprint()
+            and isinstance(payload.get("cards"), dict)
+        ):
+            self._entries = payload["cards"]
+        return self._entries
+
+    def lookup(self, file_path, full_path, signature):
+        """Return cached info for an unchanged card, or None."""
+        entry = self._load().get(file_path)
+        if not isinstance(entry, dict) or not isinstance(entry.get("info"), dict):
+            return None
+
+        mtime_ns, size = signature
+        unchanged = entry.get("mtime_ns") == mtime_ns and entry.get("size") == size
+        if not unchanged and not (
+            entry.get("size") == size and entry.get("sha256") == _file_digest(full_path)
+        ):
+            return None
+        try:
+            info = UseCaseInfo.from_dict(entry["info"])
+        except (KeyError, TypeError):  # an entry missing or adding fields
+            return None
+        if not unchanged:
+            entry["mtime_ns"] = mtime_ns
+            self._dirty = True
+        return info
+
+    def store(self, file_path, full_path, signature, info, digest=None):
+        mtime_ns, size = signature
+        self._load()[file_path] = {
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "sha256": digest or _file_digest(full_path),
+            "info": info.as_dict(),
+        }
+        self._dirty = True
+
+    def save(self, docs_dir="docs"):
+        """Write the cache back to disk, dropping cards that no longer exist."""
+        if not self.path or not self._dirty:
+            return
 
-    for i, (file_path, _) in enumerate(card_files):
-        clean_path = str(Path(file_path).resolve().relative_to(docs_dir))
-        rendered_cards += _render_grid_use_case_card(clean_path, index=i) + "\n"
+        cards = {
+            file_path: entry
+            for file_path, entry in self._load().items()
+            if os.path.exists(os.path.join(docs_dir, file_path))
+        }
+        try:
+            payload = json.dumps(
+                {"fingerprint": _card_cache_fingerprint(), "cards": cards},
+                default=_encode_cached_value,
+            )
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Could not write card cache {self.path}: {e}")
+            return
+        self._dirty = False
+
+
+class CardRegistry:
+    """In-process cache of normalized card metadata, keyed by docs-relative path.
+
+    Each card is read and normalized once; later lookups only ``stat`` the file
+    and reuse the cached info while its mtime and size are unchanged, so
+    ``mkdocs serve`` still picks up edited cards on the next rebuild. With a
+    ``CardCache`` attached, unchanged cards also skip parsing across builds.
+    Cards are parsed by content hash, so identical files (such as a card
+    copied to another directory) share one parsed info. Parse errors are
+    remembered by signature too, so a broken card is only parsed (and
+    reported) once per build.
+    """
 
-    return rendered_cards
+    def __init__(self, docs_dir="docs", cache=None, entries=None):
+        self.docs_dir = docs_dir
+        self.cache = cache
+        self._entries = {} if entries is None else entries
+        self._parsed = {}  # sha256 of a card file -> its info
+        self._errors = {}  # path of an unparseable card -> (signature, message)
+
+    def _signature(self, file_path):
+        stat = os.stat(os.path.join(self.docs_dir, file_path))
+        return stat.st_mtime_ns, stat.st_size
+
+    def _cached(self, file_path):
+        """``(signature, info, error)`` of a card; info is None unless cached.
+
+        ``error`` is the message of an unchanged card that failed to parse.
+        """
+        signature = self._signature(file_path)
+        entry = self._entries.get(file_path)
+        if entry is not None and entry[0] == signature:
+            PROFILER.count("card registry hits")
+            return signature, entry[1], None
+        failed = self._errors.get(file_path)
+        if failed is not None and failed[0] == signature:
+            return signature, None, failed[1]
+
+        info = None
+        if self.cache is not None:
+            full_path = os.path.join(self.docs_dir, file_path)
+            info = self.cache.lookup(file_path, full_path, signature)
+            if info is not None:
+                PROFILER.count("card cache hits")
+                self._entries[file_path] = (signature, info)
+        return signature, info, None
+
+    def _register(self, file_path, signature, digest, info):
+        """Remember a parsed card by path and by content hash."""
+        self._parsed[digest] = info
+        self._entries[file_path] = (signature, info)
+        if self.cache is not None:
+            full_path = os.path.join(self.docs_dir, file_path)
+            self.cache.store(file_path, full_path, signature, info, digest)
+
+    def get(self, file_path):
+        """Return the normalized info for docs/<file_path>, parsing it if needed."""
+        signature, info, error = self._cached(file_path)
+        if error is not None:
+            raise ValueError(error)
+        if info is None:
+            digest = _file_digest(os.path.join(self.docs_dir, file_path))
+            info = self._parsed.get(digest)
+            if info is None:
+                try:
+                    info = _read_card_info(file_path)
+                except Exception as e:
+                    self._errors[file_path] = (signature, str(e))
+                    raise
+            else:
+                PROFILER.count("duplicate cards reused")
+            self._register(file_path, signature, digest, info)
+        return info
+
+    def load_many(self, file_paths, workers=0, on_error=None):
+        """Load several cards, parsing cache misses in a process pool.
+
+        Returns ``(file_path, info, error)`` tuples in the order of
+        ``file_paths``; exactly one of ``info`` and ``error`` is set.
+        ``on_error(file_path, error)`` is only called for new errors, not for
+        unchanged cards that already failed to parse.
+        """
+        results = {}
+        misses = []
+        for file_path in file_paths:
+            try:
+                signature, info, error = self._cached(file_path)
+                if info is None and error is None:
+                    full_path = os.path.join(self.docs_dir, file_path)
+                    misses.append((file_path, signature, _file_digest(full_path)))
+            except OSError as e:
+                results[file_path] = (None, e)
+                if on_error is not None:
+                    on_error(file_path, e)
+            else:
+                results[file_path] = (info, error)
+
+        for file_path, (info, error) in self._load_misses(misses, workers):
+            if error is not None and on_error is not None:
+                on_error(file_path, error)
+            results[file_path] = (info, error)
+
+        return [(file_path, *results[file_path]) for file_path in file_paths]
+
+    def _load_misses(self, misses, workers):
+        """Parse ``(file_path, signature, digest)`` cache misses.
+
+        Yields ``(file_path, (info, error))``. Each content hash not seen
+        before is parsed once, for its first file.
+        """
+        unparsed = {}
+        for file_path, _, digest in misses:
+            if digest not in self._parsed:
+                unparsed.setdefault(digest, file_path)
+        loaded = dict(zip(unparsed, _load_cards(list(unparsed.values()), workers)))
+
+        for file_path, signature, digest in misses:
+            if digest in self._parsed:
+                info, error = self._parsed[digest], None
+            else:
+                info, error = loaded[digest]
+            if unparsed.get(digest) != file_path:
+                PROFILER.count("duplicate cards reused")
+            if info is not None:
+                self._register(file_path, signature, digest, info)
+            else:
+                self._errors[file_path] = (signature, error)
+            yield file_path, (info, error)
+
+    def put(self, file_path, info):
+        """Register the info of a card that was just written to disk."""
+        signature = self._signature(file_path)
+        self._entries[file_path] = (signature, info)
+        if self.cache is not None:
+            full_path = os.path.join(self.docs_dir, file_path)
+            self.cache.store(file_path, full_path, signature, info)
+
+    def slug_conflicts(self):
+        """Paths of the loaded cards sharing a slug with a different card.
+
+        Such cards get the same ``grid-card-{slug}`` id, so the rotator's
+        ``data-explore-target`` may jump to the wrong one. Returns sorted path
+        lists by slug; identical copies of a card are no conflict.
+        """
+        by_slug = {}
+        for file_path, (_, info) in self._entries.items():
+            if os.path.exists(os.path.join(self.docs_dir, file_path)):
+                by_slug.setdefault(_card_slug(file_path), []).append((file_path, info))
+        return {
+            slug: sorted(file_path for file_path, _ in cards)
+            for slug, cards in sorted(by_slug.items())
+            if any(info != cards[0][1] for _, info in cards[1:])
+        }
 
+    def invalidate(self, file_path=None):
+        """Drop one cached card, or every card when no path is given."""
+        if file_path is None:
+            self._entries.clear()
+            self._parsed.clear()
+            self._errors.clear()
+        else:
+            self._errors.pop(file_path, None)
+            _, info = self._entries.pop(file_path, (None, None))
+            for digest, parsed in list(self._parsed.items()):
+                if parsed is info:
+                    del self._parsed[digest]
+
+    def save(self):
+        """Persist newly parsed cards to the on-disk cache, if one is attached."""
+        if self.cache is not None:
+            self.cache.save(self.docs_dir)
+
+
+def _load_cards(file_paths, workers=0):
+    """``(info, error_message)`` of each card, parsed in a process pool."""
+    if workers > 1 and len(file_paths) > 1:
+        _make_importable_for_workers()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(
+                pool.map(
+                    _load_card_for_pool,
+                    file_paths,
+                    chunksize=max(1, len(file_paths) // (workers * 4)),
+                )
+            )
+    return [_load_card_for_pool(file_path) for file_path in file_paths]
 
-def _build_action_buttons(info, entry_link, publication, repo_link, media_url):
-    """Build icon-button anchor tags for a grid use-case card."""
-    cls = "grid-use-case-card__icon-button"
-    buttons = []
-    if info["entry_link"]:
-        buttons.append(
-            f'<a class="{cls}" href="{entry_link}"'
-            f' target="_blank" rel="noopener"'
-            f' title="Open in NOMAD">{_icon_nomad()}</a>'
-        )
-    if info["publication"]:
-        buttons.append(
-            f'<a class="{cls}" href="{publication}"'
-            f' target="_blank" rel="noopener"'
-            f' title="View Publication">{_icon_document()}</a>'
-        )
-    if info["repo_link"]:
-        buttons.append(
-            f'<a class="{cls}" href="{repo_link}"'
-            f' target="_blank" rel="noopener"'
-            f' title="View Repository">{_icon_github()}</a>'
-        )
-    if info["media_url"]:
-        buttons.append(
-            f'<a class="{cls}" href="{media_url}"'
-            f' target="_blank" rel="noopener"'
-            f' title="Watch Media">{_icon_play()}</a>'
-        )
-    return buttons
 
+def _load_card_for_pool(file_path):
+    """Parse and normalize one card, returning ``(info, error_message)``."""
+    try:
+        return _read_card_info(file_path), None
+    except Exception as e:
+        return None, str(e)
 
-def _build_stats_html(info):
-    """Build usage-statistics HTML block for a grid use-case card."""
-    stat_parts = []
-    if info["active_users"]:
-        stat_parts.append(
-            '<div class="grid-use-case-card__stat">'
-            f'{_icon_users()}'
-            f'<span>{esc(info["active_users"])} active users</span>'
-            '</div>'
-        )
-    if info["downloads"]:
-        stat_parts.append(
-            '<div class="grid-use-case-card__stat">'
-            f'{_icon_download()}'
-            f'<span>{esc(info["downloads"])} downloads</span>'
-            '</div>'
-        )
-    if not stat_parts:
-        return ""
-    return f'''
-            <div class="grid-use-case-card__detail">
-              <h4>Usage Statistics</h4>
-              <div class="grid-use-case-card__stats">
-                {"".join(stat_parts)}
-              </div>
-            </div>
-            '''
-
-
-def _build_left_column(info, data_size, technique, stats_html, coauthors_html):
-    """Build the left column detail blocks for a grid use-case card."""
-    col = []
-    if info["data_size"]:
-        col.append(f'''
-            <div class="grid-use-case-card__detail">
-              <h4>Data Size</h4>
-              <p>{data_size}</p>
-            </div>
-            ''')
-    if info["technique"]:
-        col.append(f'''
-            <div class="grid-use-case-card__detail">
-              <h4>Technique</h4>
-              <p>{technique}</p>
-            </div>
-            ''')
-    if stats_html:
-        col.append(stats_html)
-    if coauthors_html:
-        col.append(coauthors_html)
-    return col
 
+def _make_importable_for_workers():
+    """Expose this file to pool workers under its module name.
 
-def _build_right_column(info, escaped):
-    """Build the right column detail blocks for a grid use-case card."""
-    publication = escaped["publication"]
-    repo_link = escaped["repo_link"]
-    dataset_reference = escaped["dataset_reference"]
-    funding = escaped["funding"]
-    media_url = escaped["media_url"]
-    col = []
-    if info["publication"]:
-        col.append(f'''
-            <div class="grid-use-case-card__detail">
-              <h4>Publication Reference</h4>
-              <a href="{publication}" target="_blank"
-                 rel="noopener">{publication}</a>
-            </div>
-            ''')
-    if info["repo_link"]:
-        col.append(f'''
-            <div class="grid-use-case-card__detail">
-              <h4>Repository Reference</h4>
-              <a href="{repo_link}" target="_blank"
-                 rel="noopener">{repo_link}</a>
-            </div>
-            ''')
-    if info["dataset_reference"]:
-        col.append(f'''
-            <div class="grid-use-case-card__detail">
-              <h4>Dataset Reference</h4>
-              <a href="{dataset_reference}" target="_blank"
-                 rel="noopener">{dataset_reference}</a>
-            </div>
-            ''')
-    if info["funding"]:
-        col.append(f'''
-            <div class="grid-use-case-card__detail">
-              <h4>Funding Reference</h4>
-              <p>{funding}</p>
-            </div>
-            ''')
-    if info["media_url"]:
-        col.append(f'''
-            <div class="grid-use-case-card__detail">
-              <h4>Media URL</h4>
-              <a href="{media_url}" target="_blank"
-                 rel="noopener">{media_url}</a>
-            </div>
-            ''')
-    return col
-
-
-def _render_grid_use_case_card(file_path, index=0):
-    """Grid card renderer for the Explore section."""
+    mkdocs-macros executes main.py without registering it in sys.modules, so
+    the functions defined here could not be pickled for a process pool.
+    """
+    module = sys.modules.get(__name__)
+    if getattr(module, "_load_card_for_pool", None) is not _load_card_for_pool:
+        module = types.ModuleType(__name__)
+        module.__dict__.update(globals())
+        sys.modules[__name__] = module
+
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    if module_dir not in sys.path:
+        sys.path.append(module_dir)
+
+
+def _configured_workers(extra=None):
+    """Worker count from the environment, else from mkdocs `extra` config."""
+    value = os.environ.get(CARD_WORKERS_ENV)
+    if value is None and extra:
+        value = extra.get("gallery_workers")
     try:
-        data, body = _read_front_matter_from_docs(file_path)
-        info = _normalize_use_case_info(data, body)
-
-        title = esc(info["title"])
-        description = esc(info["description"])
-        institution = esc(info["institution"])
-        country = esc(info["country"])
-        research_field = esc(info["research_field"])
-        methodology = esc(info["methodology"])
-        submitter = esc(info["submitter"])
-        submission_date = esc(info["submission_date"])
-        technique = esc(info["technique"])
-        data_size = esc(info["data_size"])
-        funding = esc(info["funding"])
-        publication = esc(info["publication"])
-        repo_link = esc(info["repo_link"])
-        entry_link = esc(info["entry_link"])
-        dataset_reference = esc(info["dataset_reference"])
-        media_url = esc(info["media_url"])
-        image_path = esc(info["image_path"])
-        image_name = esc(info["image_name"])
+        return max(0, int(value or 0))
+    except (TypeError, ValueError):
+        print(f"Ignoring invalid gallery worker count: {value!r}")
+        return 0
 
-        gradient = CARD_GRADIENTS[index % len(CARD_GRADIENTS)]
-        keywords_csv = ",".join(info["keywords"]) if info["keywords"] else ""
-        slug = Path(file_path).stem.lower().replace("_", "-").replace(" ", "-")
 
-        image_html = ""
-        if info["image_path"]:
-            image_html = f'''
-            <div class="grid-use-case-card__hero-image">
-              <img src="{image_path}" alt="{image_name}">
-            </div>
-            '''
-
-        action_buttons = _build_action_buttons(
-            info, entry_link, publication, repo_link, media_url
-        )
+CARD_REGISTRY = CardRegistry(cache=CardCache(), entries=_SERVE_STATE.card_infos)
 
-        keyword_items = []
-        shown_keywords = info["keywords"][:MAX_SHOWN_KEYWORDS]
-        for kw in shown_keywords:
-            keyword_items.append(
-                f'<span class="grid-use-case-card__keyword">#{esc(kw)}</span>'
-            )
-        if len(info["keywords"]) > MAX_SHOWN_KEYWORDS:
-            extra = len(info["keywords"]) - MAX_SHOWN_KEYWORDS
-            keyword_items.append(
-                f'<span class="grid-use-case-card__keyword-more">+{extra}</span>'
-            )
 
-        expanded_keywords = "".join(
-            f'<span class="grid-use-case-card__keyword">#{esc(kw)}</span>'
-            for kw in info["keywords"]
+class ImageCache:
+    """Content-addressed cache of card images and their thumbnails.
+
+    Originals are stored as ``originals/<sha256><suffix>``; ``index.json``
+    remembers which remote URL produced which digest, so rebuilds work offline
+    once an image was fetched. Images under docs/ are re-read on every build.
+    Sources may be http(s) URLs or paths inside docs/; only files that are
+    images (see ``_is_image``) are cached and published.
+    """
+
+    def __init__(self, path=IMAGE_CACHE_PATH, enabled=False):
+        self.path = path
+        self.enabled = enabled
+        self._index = None
+        self._resolved = {}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._index is None:
+            try:
+                with open(os.path.join(self.path, "index.json"), encoding="utf-8") as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = {}
+            if not isinstance(index, dict):
+                index = {}
+            index.setdefault("sources", {})
+            index.setdefault("images", {})
+            self._index = index
+        return self._index
+
+    def _original(self, source):
+        """Path of the cached original of ``source``, fetching it if needed."""
+        remote = "://" in source
+        if remote:
+            if urllib.parse.urlsplit(source).scheme.lower() not in ("http", "https"):
+                raise ValueError("only http(s) image URLs are fetched")
+            with self._lock:
+                known = self._load()["sources"].get(source)
+            if known:
+                cached = Path(self.path, "originals", known)
+                if cached.exists():
+                    return cached
+            with urllib.request.urlopen(source, timeout=IMAGE_FETCH_TIMEOUT) as r:
+                data = r.read()
+        else:
+            docs_dir = Path("docs").resolve()
+            local = (docs_dir / source).resolve()
+            if not local.is_relative_to(docs_dir):
+                raise ValueError("local image paths must stay inside docs/")
+            data = local.read_bytes()
+        if not _is_image(data):
+            raise ValueError("not an image")
+
+        suffix = Path(urllib.parse.urlsplit(source).path).suffix.lower()
+        name = hashlib.sha256(data).hexdigest() + suffix
+        original = Path(self.path, "originals", name)
+        if not original.exists():
+            original.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = original.with_name(f"{name}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, original)
+        if remote:
+            with self._lock:
+                self._load()["sources"][source] = name
+        return original
+
+    def _variant(self, original, size):
+        """``(file, width, height)`` of the image served for ``size``."""
+        key = f"{original.name}:{size}"
+        with self._lock:
+            known = self._load()["images"].get(key)
+        if known and Path(self.path, known[0]).exists():
+            return Path(self.path, known[0]), known[1], known[2]
+
+        variant, width, height = original, None, None
+        if Image is not None:
+            with Image.open(original) as image:
+                width, height = image.size
+                # Animated images keep their original file, WebP stills do not.
+                if not getattr(image, "is_animated", False):
+                    image.thumbnail((IMAGE_WIDTHS[size], height), Image.LANCZOS)
+                    width, height = image.size
+                    variant = Path(
+                        self.path, "thumbnails", f"{original.stem}-{width}.webp"
+                    )
+                    if not variant.exists():
+                        variant.parent.mkdir(parents=True, exist_ok=True)
+                        tmp_path = variant.with_name(
+                            f"{variant.name}.{threading.get_ident()}.tmp"
+                        )
+                        image.save(tmp_path, "WEBP", quality=82)
+                        os.replace(tmp_path, variant)
+
+        with self._lock:
+            self._load()["images"][key] = [
+                str(variant.relative_to(self.path)),
+                width,
+                height,
+            ]
+        return variant, width, height
+
+    def resolve(self, source, size="hero"):
+        """Local image for a card ``image_path``, or None to keep hot-linking.
+
+        Returns a dict with ``src`` (site-relative), ``width`` and ``height``
+        and registers the file in GENERATED_FILES.
+        """
+        if not self.enabled or not source:
+            return None
+        if (source, size) not in self._resolved:
+            try:
+                variant, width, height = self._variant(self._original(source), size)
+            except (OSError, ValueError) as e:
+                print(f"Error caching image {source}: {e}")
+                image = None
+            else:
+                image = {
+                    "src": f"{IMAGE_SITE_DIR}/{variant.name}",
+                    "file": variant,
+                    "width": width,
+                    "height": height,
+                }
+            self._resolved[source, size] = image
+        image = self._resolved[source, size]
+        if image is not None:
+            GENERATED_FILES[image["src"]] = image["file"]
+        return image
+
+    def prefetch(self, requests):
+        """Resolve ``(source, size)`` pairs in threads; return the site files."""
+        if not self.enabled:
+            return {}
+        requests = [request for request in dict.fromkeys(requests) if request[0]]
+        with ThreadPoolExecutor(max_workers=IMAGE_FETCH_THREADS) as pool:
+            images = list(pool.map(lambda request: self.resolve(*request), requests))
+        return {image["src"]: str(image["file"]) for image in images if image}
+
+    def prune(self, published):
+        """Drop the cached images a build did not publish; return how many.
+
+        ``published`` are the files written into the site (GENERATED_FILES
+        values). Originals are kept for the thumbnails among them.
+        """
+        if not self.enabled or self._index is None:
+            return 0
+        kept = {Path(file).resolve() for file in published if isinstance(file, Path)}
+        digests = {file.name[:64] for file in kept}
+        removed = 0
+        for folder in ("originals", "thumbnails"):
+            for file in Path(self.path, folder).glob("*"):
+                if folder == "originals" and file.name[:64] in digests:
+                    continue
+                if file.resolve() not in kept:
+                    file.unlink()
+                    removed += 1
+        with self._lock:
+            index = self._load()
+            index["sources"] = {
+                source: name
+                for source, name in index["sources"].items()
+                if name[:64] in digests
+            }
+            index["images"] = {
+                key: image
+                for key, image in index["images"].items()
+                if Path(self.path, image[0]).exists()
+            }
+        return removed
+
+    def save(self):
+        """Persist the source index so that later builds can run offline."""
+        if self._index is None:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        index_path = os.path.join(self.path, "index.json")
+        tmp_path = f"{index_path}.tmp"
+        with self._lock, open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, index_path)
+
+
+CARD_IMAGES = ImageCache()
+
+# Leading bytes of the image formats accepted when Pillow is not installed.
+IMAGE_SIGNATURES = (b"\x89PNG\r\n\x1a\n", b"\xff\xd8\xff", b"GIF87a", b"GIF89a")
+
+
+def _is_image(data):
+    """Whether ``data`` is an image, as identified by Pillow.
+
+    Without Pillow, PNG, JPEG, GIF and WebP files are recognized by their
+    leading bytes.
+    """
+    if Image is None:
+        return data.startswith(IMAGE_SIGNATURES) or (
+            data[:4] == b"RIFF" and data[8:12] == b"WEBP"
         )
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.verify()
+    except Exception:
+        return False
+    return True
+
+
+def _image_attributes(source, size):
+    """``src`` (plus size and lazy loading when cached) of a card image tag."""
+    image = CARD_IMAGES.resolve(source, size)
+    if image is None:
+        return f' src="{esc(source)}"'
+    attributes = f' src="{esc(image["src"])}"'
+    if image["width"]:
+        attributes += f' width="{image["width"]}" height="{image["height"]}"'
+    return attributes + ' loading="lazy"'
+
+
+# Gallery SVG icons as (presentation attributes, child elements). They are
+# either inlined into every card or, in sprite mode, defined once per page as
+# <symbol>s that the cards reference with <use href="#icon-...">.
+_GITHUB_PATH = (
+    "M12 0C5.373 0 0 5.373 0 12c0 5.302 3.438 9.8 8.207 11.387"
+    ".599.111.793-.261.793-.577v-2.234c-3.338.726-4.033-1.416"
+    "-4.033-1.416-.546-1.387-1.333-1.756-1.333-1.756-1.089-.745"
+    ".083-.729.083-.729 1.205.084 1.839 1.237 1.839 1.237 1.07"
+    " 1.834 2.807 1.304 3.492.997.107-.775.418-1.305.762-1.604"
+    "-2.665-.305-5.467-1.334-5.467-5.931 0-1.311.469-2.381"
+    " 1.236-3.221-.124-.303-.535-1.524.117-3.176 0 0 1.008-.322"
+    " 3.301 1.23A11.48 11.48 0 0 1 12 6.844c1.02.005 2.047.138"
+    " 3.006.404 2.291-1.552 3.297-1.23 3.297-1.23.653 1.653.242"
+    " 2.874.118 3.176.77.84 1.235 1.911 1.235 3.221 0 4.609"
+    "-2.807 5.624-5.479 5.921.43.372.823 1.102.823 2.222v3.293"
+    "c0 .319.192.694.801.576C20.566 21.799 24 17.302 24 12"
+    " 24 5.373 18.627 0 12 0z"
+)
+_STROKED = 'fill="none" stroke="currentColor" stroke-width="2"'
+_FILLED = 'fill="currentColor"'
+SVG_ICONS = {
+    "calendar": (
+        _STROKED,
+        (
+            '<rect x="3" y="4" width="18" height="18" rx="2" ry="2"></rect>',
+            '<line x1="16" y1="2" x2="16" y2="6"></line>',
+            '<line x1="8" y1="2" x2="8" y2="6"></line>',
+            '<line x1="3" y1="10" x2="21" y2="10"></line>',
+        ),
+    ),
+    "chevron-down": (_STROKED, ('<polyline points="6 9 12 15 18 9"></polyline>',)),
+    "document": (
+        _STROKED,
+        (
+            '<path d="M13 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12'
+            'a2 2 0 0 0 2-2V9z"></path>',
+            '<polyline points="13 2 13 9 20 9"></polyline>',
+            '<line x1="8" y1="13" x2="16" y2="13"></line>',
+            '<line x1="8" y1="17" x2="16" y2="17"></line>',
+        ),
+    ),
+    "github": (_FILLED, (f'<path d="{_GITHUB_PATH}"></path>',)),
+    "play": (_FILLED, ('<polygon points="5 3 19 12 5 21 5 3"></polygon>',)),
+    "users": (
+        _STROKED,
+        (
+            '<path d="M17 21v-2a4 4 0 0 0-4-4H5a4 4 0 0 0-4 4v2"></path>',
+            '<circle cx="9" cy="7" r="4"></circle>',
+            '<path d="M23 21v-2a4 4 0 0 0-3-3.87"></path>',
+            '<path d="M16 3.13a4 4 0 0 1 0 7.75"></path>',
+        ),
+    ),
+    "download": (
+        _STROKED,
+        (
+            '<path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path>',
+            '<polyline points="7 10 12 15 17 10"></polyline>',
+            '<line x1="12" y1="15" x2="12" y2="3"></line>',
+        ),
+    ),
+}
+ICON_NOMAD = (
+    '<img src="assets/images/page/nomad-logo.png" alt="NOMAD" aria-hidden="true">'
+)
+INLINE_ICONS = {
+    name: f'<svg viewBox="0 0 24 24" {attrs} aria-hidden="true">'
+    + "".join(f"\n      {element}" for element in elements)
+    + "\n    </svg>"
+    for name, (attrs, elements) in SVG_ICONS.items()
+}
+SPRITE_ICONS = {
+    name: f'<svg viewBox="0 0 24 24" {attrs} aria-hidden="true">'
+    f'<use href="#icon-{name}"></use></svg>'
+    for name, (attrs, _) in SVG_ICONS.items()
+}
+ICON_SPRITE = (
+    '<svg xmlns="http://www.w3.org/2000/svg" style="display: none;"'
+    ' aria-hidden="true">'
+    + "".join(
+        f'<symbol id="icon-{name}" viewBox="0 0 24 24">{"".join(elements)}</symbol>'
+        for name, (_, elements) in SVG_ICONS.items()
+    )
+    + "</svg>"
+)
 
-        stats_html = _build_stats_html(info)
 
-        coauthors_html = ""
-        coauthors = info.get("coauthors", [])
-        if coauthors:
-            coauthors_html = f'''
-            <div class="grid-use-case-card__detail">
-              <h4>Contributors</h4>
-              <p>{esc(", ".join(coauthors))}</p>
-            </div>
-            '''
+class _Template:
+    """HTML template compiled once, then filled in with ``render(**values)``.
 
-        left_column = _build_left_column(
-            info, data_size, technique, stats_html, coauthors_html
-        )
-        escaped_vals = {
-            "publication": publication,
-            "repo_link": repo_link,
-            "dataset_reference": dataset_reference,
-            "funding": funding,
-            "media_url": media_url,
-        }
-        right_column = _build_right_column(info, escaped_vals)
+    ``{name}`` marks a slot and ``{{``/``}}`` are literal braces, as for
+    ``str.format``. Slots named in ``constants`` are filled in when the
+    template is compiled, verbatim. Indentation and blank lines of the
+    template source are dropped, as they only add bytes to the page.
 
-        return f'''
+    ``render`` is generated code, so filling a template in does not parse
+    it again.
+    """
+
+    def __init__(self, source, **constants):
+        chunks = [""]
+        self.slots = []
+        for literal, name, _, _ in string.Formatter().parse(source):
+            chunks[-1] += _TEMPLATE_INDENT.sub("\n", literal)
+            if name is None:
+                continue
+            if name in constants:
+                chunks[-1] += constants[name]
+            else:
+                self.slots.append(name)
+                chunks.append("")
+
+        # One f-string, as written by hand: CPython builds it in a single step.
+        parts = [_fstring_literal(chunks[0])]
+        for name, chunk in zip(self.slots, chunks[1:]):
+            parts += (f"f'{{{name}}}'", _fstring_literal(chunk))
+        params = ", ".join(["*", *dict.fromkeys(self.slots)])
+        namespace = {}
+        exec(f"def render({params}):\n    return {' '.join(parts)}", namespace)
+        self.render = namespace["render"]
+
+
+def _fstring_literal(text):
+    """Source of an f-string literal evaluating to ``text``."""
+    return "f" + repr(text.replace("{", "{{").replace("}", "}}"))
+
+
+_TEMPLATE_INDENT = re.compile(r"[ \t]*\n\s*")
+
+_GRID_CARD = """
 <article class="grid-use-case-card gallery-card"
   id="grid-card-{slug}"
   data-submission-date="{submission_date}"
   data-methodology="{methodology}"
   data-country="{country}"
   data-research-field="{research_field}"
-  data-keywords="{esc(keywords_csv)}"
+  data-keywords="{keywords_csv}"
   style="--grid-card-gradient: {gradient};">
 
   <div class="grid-use-case-card__hero" style="background: {gradient};">
@@ -467,7 +1092,7 @@ def _render_grid_use_case_card(file_path, index=0):
     <div class="grid-use-case-card__shade"></div>
 
     <div class="grid-use-case-card__hero-actions">
-      {"".join(action_buttons)}
+      {action_buttons}
     </div>
   </div>
 
@@ -491,85 +1116,1471 @@ def _render_grid_use_case_card(file_path, index=0):
     <p class="grid-use-case-card__description is-collapsed">{description}</p>
 
     <div class="grid-use-case-card__keywords">
-      {"".join(keyword_items)}
+      {shown_keywords}
     </div>
 
     <div class="grid-use-case-card__meta">
       <span>By {submitter}</span>
       <div class="grid-use-case-card__meta-right">
-        {_icon_calendar()}
+        {calendar}
         <span>{submission_date}</span>
       </div>
     </div>
 
     <button class="grid-use-case-card__toggle" type="button" aria-expanded="false">
       <span class="grid-use-case-card__toggle-label">View Details</span>
-      {_icon_chevron_down()}
+      {chevron_down}
     </button>
   </div>
 
   <div class="grid-use-case-card__expanded">
     <div class="grid-use-case-card__expanded-grid">
       <div class="grid-use-case-card__section">
-        {"".join(left_column)}
+        {left_column}
         <div class="grid-use-case-card__detail">
           <h4>Keywords</h4>
           <div class="grid-use-case-card__keywords">{expanded_keywords}</div>
         </div>
       </div>
       <div class="grid-use-case-card__section">
-        {"".join(right_column)}
+        {right_column}
       </div>
     </div>
   </div>
 </article>
-'''
+"""
+_GRID_CARD_IMAGE = """
+<div class="grid-use-case-card__hero-image">
+  <img{image_attributes} alt="{image_name}">
+</div>
+"""
+_GRID_CARD_BUTTON = (
+    '<a class="grid-use-case-card__icon-button" href="{url}"'
+    ' target="_blank" rel="noopener" title="{label}">{icon}</a>'
+)
+_GRID_CARD_STAT = (
+    '<div class="grid-use-case-card__stat">{icon}<span>{value} {label}</span></div>'
+)
+_GRID_CARD_STATS = """
+<div class="grid-use-case-card__detail">
+  <h4>Usage Statistics</h4>
+  <div class="grid-use-case-card__stats">
+    {stats}
+  </div>
+</div>
+"""
+_GRID_CARD_TEXT_DETAIL = """
+<div class="grid-use-case-card__detail">
+  <h4>{heading}</h4>
+  <p>{value}</p>
+</div>
+"""
+_GRID_CARD_LINK_DETAIL = """
+<div class="grid-use-case-card__detail">
+  <h4>{heading}</h4>
+  <a href="{value}" target="_blank"
+     rel="noopener">{value}</a>
+</div>
+"""
+_KEYWORD = _Template('<span class="grid-use-case-card__keyword">#{keyword}</span>')
+_ROTATOR_CARD = _Template("""
+<div class="featured-rotator-card" data-explore-target="grid-card-{slug}">
+  <div class="featured-rotator-card__hero" style="background: {gradient};">
+    {image_html}
+    <div class="featured-rotator-card__pattern"></div>
+  </div>
+  <div class="featured-rotator-card__body">
+    <p class="featured-rotator-card__title">{title}</p>
+    <span class="featured-rotator-card__field">{research_field}</span>
+    <button class="featured-rotator-card__explore-btn"
+      type="button">View in Gallery</button>
+  </div>
+</div>""".lstrip())
+_ROTATOR_CARD_IMAGE = _Template(
+    '<img class="featured-rotator-card__img"{image_attributes} alt="{image_name}">'
+)
+
+
+def _grid_card_templates(icons):
+    """The compiled grid card templates for one icon set."""
+    text_detail = _GRID_CARD_TEXT_DETAIL.strip()
+    link_detail = _GRID_CARD_LINK_DETAIL.strip()
+    return types.SimpleNamespace(
+        card=_Template(
+            _GRID_CARD, calendar=icons["calendar"], chevron_down=icons["chevron-down"]
+        ),
+        image=_Template(_GRID_CARD_IMAGE.strip()),
+        button_nomad=_Template(
+            _GRID_CARD_BUTTON, label="Open in NOMAD", icon=ICON_NOMAD
+        ),
+        button_publication=_Template(
+            _GRID_CARD_BUTTON, label="View Publication", icon=icons["document"]
+        ),
+        button_repository=_Template(
+            _GRID_CARD_BUTTON, label="View Repository", icon=icons["github"]
+        ),
+        button_media=_Template(
+            _GRID_CARD_BUTTON, label="Watch Media", icon=icons["play"]
+        ),
+        stats=_Template(_GRID_CARD_STATS.strip()),
+        stat_active_users=_Template(
+            _GRID_CARD_STAT, label="active users", icon=icons["users"]
+        ),
+        stat_downloads=_Template(
+            _GRID_CARD_STAT, label="downloads", icon=icons["download"]
+        ),
+        # The detail blocks of the expanded card's columns, by field
+        data_size=_Template(text_detail, heading="Data Size"),
+        technique=_Template(text_detail, heading="Technique"),
+        contributors=_Template(text_detail, heading="Contributors"),
+        publication=_Template(link_detail, heading="Publication Reference"),
+        repo_link=_Template(link_detail, heading="Repository Reference"),
+        dataset_reference=_Template(link_detail, heading="Dataset Reference"),
+        funding=_Template(text_detail, heading="Funding Reference"),
+        media_url=_Template(link_detail, heading="Media URL"),
+    )
+
+
+# Compiled once at import, keyed by whether icons come from the page's sprite.
+_GRID_CARD_TEMPLATES = {
+    False: _grid_card_templates(INLINE_ICONS),
+    True: _grid_card_templates(SPRITE_ICONS),
+}
+
+
+def _card_file_paths(cards_dir="docs/cards"):
+    """Docs-relative paths of the markdown cards in a directory."""
+    relative_dir = Path(cards_dir).resolve().relative_to(Path("docs").resolve())
+    return [
+        str(relative_dir / filename)
+        for filename in os.listdir(cards_dir)
+        if filename.endswith(".md")
+    ]
+
+
+def _sorted_card_paths(cards_dir="docs/cards", workers=None):
+    """Docs-relative paths of the parseable cards, newest submission date first.
+
+    With ``workers`` > 1 (default: ``NOMAD_GALLERY_WORKERS``), cards missing
+    from the caches are parsed in a process pool; the result is identical to
+    the serial path.
+    """
+    card_files = _loaded_cards(cards_dir, workers)
+    # Cards without a valid date (ordinal 0) go last; ties keep file name order.
+    card_files.sort(key=lambda card: card[1].submission_ordinal, reverse=True)
+    return [clean_path for clean_path, _ in card_files]
+
+
+def _loaded_cards(cards_dir="docs/cards", workers=None):
+    """``(file_path, info)`` of the parseable cards, in file name order."""
+    if workers is None:
+        workers = _configured_workers()
+    if not os.path.exists(cards_dir):
+        return []
+
+    def report(clean_path, error):
+        print(f"Error parsing {Path(clean_path).name}: {error}")
+
+    clean_paths = sorted(_card_file_paths(cards_dir))
+    return [
+        (clean_path, info)
+        for clean_path, info, _ in CARD_REGISTRY.load_many(
+            clean_paths, workers, on_error=report
+        )
+        if info is not None
+    ]
+
+
+def _metric_value(value):
+    return value if isinstance(value, int) and not isinstance(value, bool) else -1
+
+
+# Ranking keys of select_top_cards; ties go to the newer card.
+CARD_RANKINGS = {
+    "newest": lambda info: info.submission_ordinal,
+    "downloads": lambda info: (
+        _metric_value(info.downloads),
+        info.submission_ordinal,
+    ),
+    "active_users": lambda info: (
+        _metric_value(info.active_users),
+        info.submission_ordinal,
+    ),
+}
+
+
+def select_top_cards(cards_dir="docs/cards", k=3, by="newest", workers=None):
+    """Docs-relative paths of the ``k`` best cards by a CARD_RANKINGS key.
+
+    Uses a bounded heap (O(n log k)) instead of sorting every card.
+    """
+    rank = CARD_RANKINGS[by]
+    top = heapq.nlargest(
+        k, _loaded_cards(cards_dir, workers), key=lambda card: rank(card[1])
+    )
+    return [clean_path for clean_path, _ in top]
+
+
+def featured_card_paths(
+    cards_dir="docs/cards", k=3, by="newest", pinned=None, workers=None
+):
+    """Docs-relative paths of the ``k`` cards of the featured rotator.
+
+    The cards of the ``pinned`` directory, such as hand-picked highlights,
+    come first in file name order; the remaining slides are the top cards of
+    ``cards_dir`` (see ``select_top_cards``) that are not pinned already.
+    """
+    selected = [path for path, _ in _loaded_cards(pinned, workers)] if pinned else []
+    slugs = {_card_slug(path) for path in selected}
+    for path in select_top_cards(cards_dir, k + len(selected), by, workers):
+        if _card_slug(path) not in slugs:
+            selected.append(path)
+    return selected[:k]
+
+
+def iter_sorted_cards(cards_dir="docs/cards", workers=None, icon_sprite=False):
+    """Yield the rendered cards of a directory, newest submission date first.
+
+    See ``_sorted_card_paths`` for ``workers``. With ``icon_sprite`` the cards
+    reference the page's ``ICON_SPRITE`` instead of inlining their SVG icons.
+    """
+    clean_paths = _sorted_card_paths(cards_dir, workers)
+    CARD_IMAGES.prefetch(
+        (CARD_REGISTRY.get(clean_path).image_path, "hero")
+        for clean_path in clean_paths
+    )
+
+    keys = set()
+    for i, clean_path in enumerate(clean_paths):
+        yield _render_grid_use_case_card_memoized(clean_path, i, icon_sprite, keys)
+        yield "\n"
+
+    _prune_rendered_cards(cards_dir, keys)
+
+
+def render_sorted_cards(cards_dir="docs/cards", workers=None, icon_sprite=False):
+    """Render all cards from the specified directory, sorted by submission date."""
+    return "".join(iter_sorted_cards(cards_dir, workers, icon_sprite))
+
+
+def write_sorted_cards(
+    stream, cards_dir="docs/cards", workers=None, icon_sprite=False
+):
+    """Write the sorted cards to a text stream without building one big string."""
+    stream.writelines(iter_sorted_cards(cards_dir, workers, icon_sprite))
+
+
+def shard_sorted_cards(
+    cards_dir="docs/cards", shard_size=48, workers=None, icon_sprite=False
+):
+    """Render the sorted cards as HTML shards of at most ``shard_size`` cards.
+
+    Concatenating the shards gives exactly ``render_sorted_cards``; the sort
+    order and card gradients run on across shard boundaries.
+    """
+    return _split_into_shards(
+        iter_sorted_cards(cards_dir, workers, icon_sprite), shard_size
+    )
+
+
+def _split_into_shards(pieces, shard_size):
+    """Group alternating card/separator pieces into shards of joined HTML."""
+    shards = []
+    current = []
+    pieces = iter(pieces)
+    for card, separator in zip(pieces, pieces):
+        current += (card, separator)
+        if len(current) == 2 * shard_size:
+            shards.append("".join(current))
+            current = []
+    if current or not shards:
+        shards.append("".join(current))
+    return shards
+
+
+def build_search_index(cards_dir="docs/cards", workers=None):
+    """Precomputed filter index of the Explore grid, in newest-first order.
+
+    Each filterable field maps to a sorted dictionary of its values and the
+    cards store indexes into those dictionaries. ``postings`` lists, for every
+    keyword in ``keywords``, the positions of the cards carrying it. The index
+    is built from the same normalized info as the rendered cards.
+    """
+    infos = [
+        (clean_path, CARD_REGISTRY.get(clean_path))
+        for clean_path in _sorted_card_paths(cards_dir, workers)
+    ]
+
+    fields = {}
+    cards = {
+        "ids": [f"grid-card-{_card_slug(clean_path)}" for clean_path, _ in infos],
+        "submission_date": [str(info.submission_date) for _, info in infos],
+    }
+    for field in SEARCH_INDEX_FIELDS:
+        values = sorted({str(getattr(info, field)) for _, info in infos})
+        codes = {value: code for code, value in enumerate(values)}
+        fields[field] = values
+        cards[field] = [codes[str(getattr(info, field))] for _, info in infos]
+
+    postings = {}
+    for position, (_, info) in enumerate(infos):
+        for keyword in dict.fromkeys(str(kw).strip() for kw in info.keywords):
+            if keyword:
+                postings.setdefault(keyword, []).append(position)
+    keywords = sorted(postings)
+
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "count": len(infos),
+        "fields": fields,
+        "cards": cards,
+        "keywords": keywords,
+        "postings": [postings[keyword] for keyword in keywords],
+    }
+
+
+def _facet_key(value):
+    """Case- and whitespace-insensitive key of a facet value."""
+    return " ".join(str(value).split()).casefold()
+
+
+def _count_facet(values_per_card):
+    """Count canonical facet values; returns ``(values, counts, codes_per_card)``.
+
+    Values differing only in case or whitespace are merged under their most
+    common spelling (the first one seen on a tie). Values are ordered by
+    descending count, then alphabetically.
+    """
+    spellings = {}
+    codes_per_card = []
+    for values in values_per_card:
+        keys = []
+        for value in values:
+            key = _facet_key(value)
+            if key:
+                spelling = " ".join(str(value).split())
+                counts = spellings.setdefault(key, {})
+                counts[spelling] = counts.get(spelling, 0) + 1
+                keys.append(key)
+        codes_per_card.append(list(dict.fromkeys(keys)))
+
+    totals = {}
+    for keys in codes_per_card:
+        for key in keys:
+            totals[key] = totals.get(key, 0) + 1
+    display = {
+        key: max(counts, key=counts.get)  # max keeps the first one on a tie
+        for key, counts in spellings.items()
+    }
+    keys = sorted(totals, key=lambda key: (-totals[key], display[key].casefold()))
+    codes = {key: code for code, key in enumerate(keys)}
+    return (
+        [display[key] for key in keys],
+        [totals[key] for key in keys],
+        [[codes[key] for key in card_keys] for card_keys in codes_per_card],
+    )
+
+
+def build_facets(cards_dir="docs/cards", workers=None):
+    """Facet counts of a card directory for the filter suggestions.
+
+    For every field in FACET_FIELDS, ``facets`` lists the canonical values with
+    the number of cards carrying them (see ``_count_facet``). ``related`` holds,
+    for each keyword, ``[keyword position, cards with both]`` pairs of the
+    FACET_RELATED_LIMIT keywords occurring most often together with it, most
+    frequent first.
+    """
+    infos = [CARD_REGISTRY.get(path) for path in _sorted_card_paths(cards_dir, workers)]
+
+    facets = {}
+    keyword_codes = []
+    for field in FACET_FIELDS:
+        if field == "keywords":
+            values_per_card = [info.keywords for info in infos]
+        else:
+            values_per_card = [[getattr(info, field)] for info in infos]
+        values, counts, codes = _count_facet(values_per_card)
+        facets[field] = {"values": values, "counts": counts}
+        if field == "keywords":
+            keyword_codes = codes
+
+    pairs = {}
+    for codes in keyword_codes:
+        for first, second in itertools.permutations(codes, 2):
+            pairs.setdefault(first, {})
+            pairs[first][second] = pairs[first].get(second, 0) + 1
+    related = [
+        heapq.nsmallest(
+            FACET_RELATED_LIMIT,
+            pairs.get(code, {}).items(),
+            key=lambda item: (-item[1], item[0]),
+        )
+        for code in range(len(facets["keywords"]["values"]))
+    ]
+
+    return {
+        "version": FACETS_VERSION,
+        "count": len(infos),
+        "facets": facets,
+        "related": [[list(pair) for pair in pairs_of] for pairs_of in related],
+    }
+
+
+_EXPANDED_OPEN = '<div class="grid-use-case-card__expanded">'
+_CARD_ID = re.compile(r'id="grid-card-([^"]+)"')
+
+
+def split_card_details(card, details_url):
+    """Split a rendered grid card into the collapsed card and its details.
+
+    The expanded section is replaced by an empty placeholder pointing to
+    ``details_url(slug)``; the returned details are the section's content.
+    Cards without an expanded section (error messages) are returned as is,
+    with None as details.
+    """
+    start = card.find(_EXPANDED_OPEN)
+    slug = _CARD_ID.search(card)
+    if start < 0 or slug is None:
+        return card, None
+    end = card.rindex("</div>", start, card.rindex("</article>"))
+    placeholder = (
+        '<div class="grid-use-case-card__expanded"'
+        f' data-details-url="{esc(details_url(slug.group(1)))}">'
+    )
+    details = card[start + len(_EXPANDED_OPEN) : end]
+    return card[:start] + placeholder + card[end:], details
+
+
+def _write_generated_files(site_dir):
+    """Write GENERATED_FILES into the built site."""
+    for relative_path, content in GENERATED_FILES.items():
+        path = os.path.join(site_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if isinstance(content, Path):
+            shutil.copyfile(content, path)
+            continue
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+
+def _compressors():
+    """Compress functions of the written siblings, by file suffix."""
+    compressors = {".gz": lambda data: gzip.compress(data, 9, mtime=0)}
+    if brotli is not None:
+        compressors[".br"] = lambda data: brotli.compress(data, quality=11)
+    return compressors
+
+
+def _compress_file(path, compressors, cache_dir):
+    """Write the compressed siblings of a file.
+
+    Returns ``(size, {suffix: served size}, changed, digest)``; a sibling
+    that would not be smaller than the file is left out.
+    """
+    data = Path(path).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    sizes = {}
+    changed = False
+    for suffix, compress in compressors.items():
+        cached = Path(cache_dir, digest[:2], digest + suffix)
+        if not cached.exists():
+            changed = True
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cached.with_name(f"{cached.name}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(compress(data))
+            os.replace(tmp_path, cached)
+        sizes[suffix] = cached.stat().st_size
+        if sizes[suffix] < len(data):
+            shutil.copyfile(cached, path + suffix)
+        else:
+            sizes[suffix] = len(data)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path + suffix)
+    return len(data), sizes, changed, digest
+
+
+def _prune_compress_cache(cache_dir, digests):
+    """Remove the cached siblings of files no longer in the site; return how many."""
+    pruned = 0
+    for cached in Path(cache_dir).glob("*/*"):
+        if cached.name[:64] not in digests:
+            cached.unlink()
+            pruned += 1
+    for shard in Path(cache_dir).glob("*"):
+        with contextlib.suppress(OSError):
+            shard.rmdir()  # only empty ones
+    return pruned
+
+
+def compress_site(site_dir, workers=0, cache_dir=COMPRESS_CACHE_PATH):
+    """Write compressed siblings of the text files of a built site, in threads.
+
+    Returns the number of files, how many of them changed, their total size,
+    the total size served per sibling suffix and how many cache files of
+    earlier builds were pruned; also prints the savings.
+    """
+    paths = []
+    for root, _, names in os.walk(site_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            if (
+                name.endswith(COMPRESS_SUFFIXES)
+                and os.path.getsize(path) >= COMPRESS_MIN_SIZE
+            ):
+                paths.append(path)
+
+    compressors = _compressors()
+    with ThreadPoolExecutor(max_workers=workers or None) as pool:
+        results = list(
+            pool.map(lambda path: _compress_file(path, compressors, cache_dir), paths)
+        )
+
+    summary = {
+        "files": len(results),
+        "changed": sum(changed for _, _, changed, _ in results),
+        "size": sum(size for size, _, _, _ in results),
+        "compressed": {
+            suffix: sum(sizes[suffix] for _, sizes, _, _ in results)
+            for suffix in compressors
+        },
+        "pruned": _prune_compress_cache(
+            cache_dir, {digest for _, _, _, digest in results}
+        ),
+    }
+    savings = ", ".join(
+        f"{suffix} {size / 1024:,.0f} KiB "
+        f"(-{1 - size / max(summary['size'], 1):.0%})"
+        for suffix, size in summary["compressed"].items()
+    )
+    print(
+        f"Compressed {summary['files']} site files ({summary['changed']} changed), "
+        f"{summary['size'] / 1024:,.0f} KiB: {savings}"
+        + ("" if brotli is not None else "; install brotli for .br files")
+    )
+    return summary
+
+
+class FragmentStore:
+    """Prebuilt HTML fragments on disk, each stamped with the sources it used.
+
+    ``manifest.json`` maps a fragment's file name to its stamp (see
+    ``_fragment_stamp``) and, for grids, the length of every card in it.
+    """
+
+    def __init__(self, path=FRAGMENTS_DIR):
+        self.path = path
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(
+                    os.path.join(self.path, FRAGMENTS_MANIFEST), encoding="utf-8"
+                ) as f:
+                    payload = json.load(f)
+            except (OSError, ValueError):
+                return self._entries
+            if isinstance(payload, dict) and isinstance(
+                payload.get("fragments"), dict
+            ):
+                self._entries = payload["fragments"]
+        return self._entries
+
+    def get(self, name, stamp):
+        """Return ``(html, entry)`` of an up-to-date fragment, or None."""
+        if not self.is_current(name, stamp):
+            return None
+        entry = self._load()[name]
+        try:
+            with open(os.path.join(self.path, name), encoding="utf-8") as f:
+                return f.read(), entry
+        except OSError:
+            return None
+
+    def is_current(self, name, stamp):
+        """Whether a fragment is stamped ``stamp`` and its images are cached."""
+        entry = self._load().get(name)
+        return (
+            isinstance(entry, dict)
+            and entry.get("stamp") == stamp
+            and all(os.path.exists(file) for file in entry.get("assets", {}).values())
+        )
+
+    def put(self, name, stamp, content, **meta):
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, name), "w", encoding="utf-8") as f:
+            f.write(content)
+        self._load()[name] = {"stamp": stamp, **meta}
+
+    def save(self):
+        """Write the manifest atomically."""
+        os.makedirs(self.path, exist_ok=True)
+        manifest_path = os.path.join(self.path, FRAGMENTS_MANIFEST)
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fragments": self._load()}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+
+
+def _fragment_stamp(file_paths, **options):
+    """Identify a fragment by its card files, render options and main.py."""
+    digest = hashlib.sha256(_SOURCE_DIGEST.encode())
+    digest.update(json.dumps(options, sort_keys=True).encode())
+    for file_path in sorted(file_paths):
+        stat = os.stat(os.path.join("docs", file_path))
+        digest.update(f"{file_path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+def _grid_fragment(cards_dir, icon_sprite):
+    name = f"grid-{Path(cards_dir).name}.html"
+    file_paths = _card_file_paths(cards_dir) if os.path.exists(cards_dir) else []
+    return name, _fragment_stamp(
+        file_paths, icon_sprite=icon_sprite, images=CARD_IMAGES.enabled
+    )
+
+
+def _rotator_fragment(file_path, index):
+    name = f"rotator-{_card_slug(file_path)}-{index}.html"
+    return name, _fragment_stamp([file_path], index=index, images=CARD_IMAGES.enabled)
+
+
+def prebuilt_sorted_cards(store, cards_dir="docs/cards", icon_sprite=False):
+    """Card/separator pieces of an up-to-date prebuilt grid, or None."""
+    found = store.get(*_grid_fragment(cards_dir, icon_sprite))
+    if found is None:
+        return None
+    content, entry = found
+    _register_fragment_assets(entry)
+    pieces = []
+    start = 0
+    for length in entry.get("card_lengths", []):
+        pieces += (content[start : start + length], "\n")
+        start += length + 1
+    return pieces
+
+
+def _register_fragment_assets(entry):
+    """Schedule the cached images a prebuilt fragment refers to for the site."""
+    for site_path, file in entry.get("assets", {}).items():
+        GENERATED_FILES[site_path] = Path(file)
+
+
+def build_grid_fragment(store, cards_dir="docs/cards", workers=None, **options):
+    """Prebuild the sorted grid of a card directory; False if it was current."""
+    icon_sprite = options.get("icon_sprite", False)
+    name, stamp = _grid_fragment(cards_dir, icon_sprite)
+    if options.get("changed_only") and store.is_current(name, stamp):
+        return False
+    if workers is None:
+        workers = _configured_workers()
+
+    clean_paths = _sorted_card_paths(cards_dir, workers)
+    assets = CARD_IMAGES.prefetch(
+        (CARD_REGISTRY.get(path).image_path, "hero") for path in clean_paths
+    )
+    if workers > 1 and len(clean_paths) > 1:
+        # Workers find the parsed cards and images in the on-disk caches (or,
+        # when forked, in memory) and only render.
+        CARD_REGISTRY.save()
+        CARD_IMAGES.save()
+        _make_importable_for_workers()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            cards = list(
+                pool.map(
+                    _render_card_for_pool,
+                    [
+                        (path, i, icon_sprite, CARD_IMAGES.enabled)
+                        for i, path in enumerate(clean_paths)
+                    ],
+                    chunksize=max(1, len(clean_paths) // (workers * 4)),
+                )
+            )
+    else:
+        cards = [
+            _render_grid_use_case_card_memoized(path, i, icon_sprite)
+            for i, path in enumerate(clean_paths)
+        ]
+
+    store.put(
+        name,
+        stamp,
+        "".join(card + "\n" for card in cards),
+        card_lengths=[len(card) for card in cards],
+        assets=assets,
+    )
+    return True
+
+
+def _render_card_for_pool(args):
+    """Render a grid card in a pool worker from ``(path, index, sprite, images)``."""
+    file_path, index, icon_sprite, images = args
+    CARD_IMAGES.enabled = images
+    return _render_grid_use_case_card(file_path, index, icon_sprite)
+
+
+class CardIndex:
+    """Rendered grid of one card directory, kept up to date card by card.
+
+    Every card is held rendered around a GRADIENT_SLOT, which ``cards`` fills
+    with the gradient of the card's position, so a card moving to another
+    position is not rendered again. ``update`` re-reads one card and moves it
+    to its new position with a binary search instead of sorting the whole grid
+    again. ``state`` lets the grid outlive a reload of
+    main.py (see _SERVE_STATE).
+    """
+
+    def __init__(self, cards_dir="docs/cards", icon_sprite=False, state=None):
+        self.cards_dir = cards_dir
+        self.icon_sprite = icon_sprite
+        self._state = {} if state is None else state
+
+    @property
+    def loaded(self):
+        return "order" in self._state
+
+    @property
+    def assets(self):
+        """Cached images of the cards, as returned by ``ImageCache.prefetch``."""
+        return self._state.get("assets", {})
+
+    def load(self, workers=None):
+        """Load and render every card of the directory."""
+        signatures = self._signatures()
+        cards = _loaded_cards(self.cards_dir, workers)
+        self._state.update(
+            signatures=signatures,  # file_path -> (mtime_ns, size) when loaded
+            order=[],  # (-submission_ordinal, file_path) in grid order
+            keys={},
+            rendered={},  # file_path -> html split at GRADIENT_SLOT
+            assets=CARD_IMAGES.prefetch(
+                (info.image_path, "hero") for _, info in cards
+            ),
+        )
+        for file_path, info in cards:
+            self._insert(file_path, info)
+        return self
+
+    def _signatures(self):
+        """``(mtime_ns, size)`` of the directory's cards, by docs-relative path."""
+        if not os.path.exists(self.cards_dir):
+            return {}
+        signatures = {}
+        for file_path in _card_file_paths(self.cards_dir):
+            with contextlib.suppress(FileNotFoundError):
+                stat = os.stat(os.path.join("docs", file_path))
+                signatures[file_path] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def changed_paths(self):
+        """Cards added, edited or deleted since the last call or ``load``."""
+        old, new = self._state["signatures"], self._signatures()
+        self._state["signatures"] = new
+        return {path for path in old | new if old.get(path) != new.get(path)}
+
+    def _insert(self, file_path, info):
+        # Same order as _sorted_card_paths: newest first, then by file name.
+        key = (-info.submission_ordinal, file_path)
+        bisect.insort(self._state["order"], key)
+        self._state["keys"][file_path] = key
+        self._state["rendered"][file_path] = _render_grid_use_case_card(
+            file_path, icon_sprite=self.icon_sprite, gradient=GRADIENT_SLOT
+        ).split(GRADIENT_SLOT)
+
+    def discard(self, file_path):
+        """Take a card out of the grid and forget its parsed info."""
+        key = self._state["keys"].pop(file_path, None)
+        if key is not None:
+            order = self._state["order"]
+            del order[bisect.bisect_left(order, key)]
+            del self._state["rendered"][file_path]
+        CARD_REGISTRY.invalidate(file_path)
+
+    def update(self, file_path):
+        """Re-read one card; deleted and unparseable cards leave the grid."""
+        self.discard(file_path)
+        try:
+            info = CARD_REGISTRY.get(file_path)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Error parsing {Path(file_path).name}: {e}")
+            return
+        self._state["assets"].update(
+            CARD_IMAGES.prefetch([(info.image_path, "hero")])
+        )
+        self._insert(file_path, info)
+
+    def paths(self):
+        """Docs-relative paths of the cards in grid order."""
+        return [file_path for _, file_path in self._state["order"]]
+
+    def cards(self):
+        """The rendered cards in grid order."""
+        rendered = self._state["rendered"]
+        return [
+            CARD_GRADIENTS[i % len(CARD_GRADIENTS)].join(rendered[file_path])
+            for i, (_, file_path) in enumerate(self._state["order"])
+        ]
+
+
+class _CardChanges:
+    """watchdog event handler queueing the paths of changed markdown files."""
+
+    def __init__(self):
+        self.paths = queue.Queue()
+
+    def dispatch(self, event):
+        if event.is_directory or event.event_type not in (
+            "created",
+            "modified",
+            "deleted",
+            "moved",
+        ):
+            return
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            if path and os.fsdecode(path).endswith(".md"):
+                self.paths.put(os.fsdecode(path))
+
+
+def _apply_card_changes(index, changes):
+    """Apply the changes queued so far to a CardIndex; returns their number.
+
+    Cards whose file signature changed since the last build are updated too,
+    in case watchdog missed their events.
+    """
+    start = time.perf_counter()
+    paths = set()
+    with contextlib.suppress(queue.Empty):
+        while True:
+            paths.add(changes.get_nowait())
+    directory = Path(index.cards_dir).resolve()
+    paths.update(str(directory / Path(path).name) for path in index.changed_paths())
+    if not paths:
+        return 0
+
+    relative_dir = directory.relative_to(Path("docs").resolve())
+    for path in paths:
+        if Path(path).parent.resolve() == directory:
+            index.update(str(relative_dir / Path(path).name))
+    print(
+        f"Updated {len(paths)} card(s) of {index.cards_dir} in "
+        f"{(time.perf_counter() - start) * 1000:.0f} ms"
+    )
+    return len(paths)
+
+
+def watched_card_index(cards_dir="docs/cards", icon_sprite=False, workers=None):
+    """CardIndex of a directory, updated from file system events between builds.
+
+    The first call loads the directory and starts a watchdog observer on it;
+    later calls (also after main.py is reloaded by ``mkdocs serve``) only apply
+    the cards changed since, as reported by watchdog or found by comparing
+    file signatures. Returns None when watchdog is not installed.
+    """
+    if Observer is None:
+        return None
+    directory = Path(cards_dir).resolve()
+    if directory not in _SERVE_STATE.card_watchers:
+        changes = _CardChanges()
+        observer = Observer()
+        observer.schedule(changes, str(directory))
+        observer.start()
+        _SERVE_STATE.card_watchers[directory] = (observer, changes.paths)
+    changes = _SERVE_STATE.card_watchers[directory][1]
+
+    key = (directory, icon_sprite, CARD_IMAGES.enabled)
+    index = CardIndex(
+        cards_dir, icon_sprite, _SERVE_STATE.card_indexes.setdefault(key, {})
+    )
+    if index.loaded:
+        _apply_card_changes(index, changes)
+    else:
+        with contextlib.suppress(queue.Empty):
+            while True:  # the cards are read fresh anyway
+                changes.get_nowait()
+        index.load(workers)
+    return index
+
+
+def _watched_sorted_cards(cards_dir, icon_sprite=False, workers=None):
+    """Card/separator pieces of a watched directory, or None without watchdog."""
+    index = watched_card_index(cards_dir, icon_sprite, workers)
+    if index is None:
+        return None
+    for site_path, file in index.assets.items():
+        GENERATED_FILES[site_path] = Path(file)
+    return [piece for card in index.cards() for piece in (card, "\n")]
+
+
+def build_rotator_fragment(store, file_path, index=0, changed_only=False):
+    """Prebuild one featured rotator card; False if it was current."""
+    name, stamp = _rotator_fragment(file_path, index)
+    if changed_only and store.is_current(name, stamp):
+        return False
+    content = _render_featured_rotator_card(file_path, index)
+    try:
+        assets = CARD_IMAGES.prefetch(
+            [(CARD_REGISTRY.get(file_path).image_path, "rotator")]
+        )
+    except Exception:  # the fragment already shows the card's error
+        assets = {}
+    store.put(name, stamp, content, assets=assets)
+    return True
+
+
+def _featured_rotator_cards(page="docs/index.md"):
+    """``(file_path, index)`` of the rotator cards a page renders."""
+    try:
+        with open(page, encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return []
+    cards = [
+        (file_path, int(index) if index else position)
+        for position, (file_path, index) in enumerate(ROTATOR_CALL.findall(text))
+    ]
+    for cards_dir, k, by, pinned in ROTATOR_SLIDES_CALL.findall(text):
+        selected = featured_card_paths(
+            cards_dir, int(k or 3), by or "newest", pinned=pinned or None
+        )
+        cards += [(file_path, index) for index, file_path in enumerate(selected)]
+    return cards
+
+
+def _render_grid_use_case_card_memoized(file_path, index, icon_sprite=False, keys=None):
+    """Reuse a card's rendered HTML while its info and gradient are unchanged.
+
+    Only cards that were added or edited since the last build (or that moved to
+    a different gradient slot) are rendered again. The HTML is keyed by what it
+    is made of, so identical cards in several directories are rendered once.
+    The key used is added to ``keys``, if given.
+    """
+    info = CARD_REGISTRY.get(file_path)
+    gradient = CARD_GRADIENTS[index % len(CARD_GRADIENTS)]
+    slug = _card_slug(file_path)
+    key = (slug, repr(info), gradient, icon_sprite, CARD_IMAGES.enabled)
+    if keys is not None:
+        keys.add(key)
+
+    rendered = _SERVE_STATE.rendered_cards.get(key)
+    if rendered is not None:
+        PROFILER.count("rendered cards reused")
+        return rendered
+
+    rendered = _render_grid_use_case_card(file_path, index, icon_sprite)
+    _SERVE_STATE.rendered_cards[key] = rendered
+    return rendered
+
+
+def _prune_rendered_cards(cards_dir, keys):
+    """Forget memoized HTML that no card directory used in its last render.
+
+    ``keys`` are those of the cards of ``cards_dir`` just rendered.
+    """
+    _SERVE_STATE.rendered_card_keys[cards_dir] = keys
+    used = set().union(*_SERVE_STATE.rendered_card_keys.values())
+    for key in list(_SERVE_STATE.rendered_cards):
+        if key not in used:
+            del _SERVE_STATE.rendered_cards[key]
+
+
+def _build_action_buttons(info, templates):
+    """Build icon-button anchor tags for a grid use-case card."""
+    buttons = ""
+    if info.entry_link:
+        buttons += templates.button_nomad.render(url=info.escaped("entry_link"))
+    if info.publication:
+        buttons += templates.button_publication.render(url=info.escaped("publication"))
+    if info.repo_link:
+        buttons += templates.button_repository.render(url=info.escaped("repo_link"))
+    if info.media_url:
+        buttons += templates.button_media.render(url=info.escaped("media_url"))
+    return buttons
+
+
+def _build_stats_html(info, templates):
+    """Build usage-statistics HTML block for a grid use-case card."""
+    stats = ""
+    if info.active_users:
+        stats += templates.stat_active_users.render(
+            value=info.escaped("active_users")
+        )
+    if info.downloads:
+        stats += templates.stat_downloads.render(value=info.escaped("downloads"))
+    return templates.stats.render(stats=stats) if stats else ""
+
+
+def _build_left_column(info, templates):
+    """Build the left column detail blocks for a grid use-case card."""
+    blocks = []
+    if info.data_size:
+        blocks.append(templates.data_size.render(value=info.escaped("data_size")))
+    if info.technique:
+        blocks.append(templates.technique.render(value=info.escaped("technique")))
+    stats_html = _build_stats_html(info, templates)
+    if stats_html:
+        blocks.append(stats_html)
+    if info.coauthors:
+        value = esc(", ".join(info.coauthors))
+        blocks.append(templates.contributors.render(value=value))
+    return "\n".join(blocks)
+
+
+def _build_right_column(info, templates):
+    """Build the right column detail blocks for a grid use-case card."""
+    blocks = []
+    for field in (
+        "publication",
+        "repo_link",
+        "dataset_reference",
+        "funding",
+        "media_url",
+    ):
+        if getattr(info, field):
+            template = getattr(templates, field)
+            blocks.append(template.render(value=info.escaped(field)))
+    return "\n".join(blocks)
+
+
+def _card_slug(file_path):
+    """Slug of a card file, used in its ``grid-card-{slug}`` element id."""
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return stem.lower().replace("_", "-").replace(" ", "-")
+
+
+def _render_grid_use_case_card(file_path, index=0, icon_sprite=False, gradient=None):
+    """Grid card renderer for the Explore section.
+
+    The card's gradient is picked by ``index`` unless ``gradient`` is given.
+    """
+    templates = _GRID_CARD_TEMPLATES[icon_sprite]
+    if gradient is None:
+        gradient = CARD_GRADIENTS[index % len(CARD_GRADIENTS)]
+    try:
+        info = CARD_REGISTRY.get(file_path)
+
+        image_html = ""
+        if info.image_path:
+            image_html = templates.image.render(
+                image_attributes=_image_attributes(info.image_path, "hero"),
+                image_name=info.escaped("image_name"),
+            )
+
+        keyword_spans = [_KEYWORD.render(keyword=esc(kw)) for kw in info.keywords]
+        shown_keywords = "".join(keyword_spans[:MAX_SHOWN_KEYWORDS])
+        if len(keyword_spans) > MAX_SHOWN_KEYWORDS:
+            extra = len(keyword_spans) - MAX_SHOWN_KEYWORDS
+            shown_keywords += (
+                f'<span class="grid-use-case-card__keyword-more">+{extra}</span>'
+            )
+
+        return templates.card.render(
+            slug=_card_slug(file_path),
+            submission_date=info.escaped("submission_date"),
+            methodology=info.escaped("methodology"),
+            country=info.escaped("country"),
+            research_field=info.escaped("research_field"),
+            keywords_csv=esc(",".join(info.keywords)),
+            gradient=gradient,
+            image_html=image_html,
+            action_buttons=_build_action_buttons(info, templates),
+            title=info.escaped("title"),
+            institution=info.escaped("institution"),
+            description=info.escaped("description"),
+            shown_keywords=shown_keywords,
+            submitter=info.escaped("submitter"),
+            left_column=_build_left_column(info, templates),
+            expanded_keywords="".join(keyword_spans),
+            right_column=_build_right_column(info, templates),
+        )
     except Exception as e:
         return f"**Error loading grid use case card from {file_path}: {str(e)}**"
 
+
 def _render_featured_rotator_card(file_path, index=0):
     """Compact Figma-style thumbnail card for the featured-highlights carousel."""
     try:
-        data, body = _read_front_matter_from_docs(file_path)
+        info = CARD_REGISTRY.get(file_path)
     except Exception as exc:
         return f'<div class="featured-rotator-card">Error: {esc(str(exc))}</div>'
 
-    info = _normalize_use_case_info(data, body)
-    gradient = CARD_GRADIENTS[index % len(CARD_GRADIENTS)]
-    title = esc(info["title"])
-    research_field = esc(info["research_field"])
-    image_path = esc(info["image_path"])
-    image_name = esc(info.get("image_name", title))
-
     image_html = ""
-    if info["image_path"]:
-        image_html = (
-            f'<img class="featured-rotator-card__img"'
-            f' src="{image_path}" alt="{image_name}">'
+    if info.image_path:
+        image_html = _ROTATOR_CARD_IMAGE.render(
+            image_attributes=_image_attributes(info.image_path, "rotator"),
+            image_name=info.escaped("image_name"),
         )
 
-    slug = Path(file_path).stem.lower().replace("_", "-").replace(" ", "-")
+    return _ROTATOR_CARD.render(
+        slug=_card_slug(file_path),
+        gradient=CARD_GRADIENTS[index % len(CARD_GRADIENTS)],
+        image_html=image_html,
+        title=info.escaped("title"),
+        research_field=info.escaped("research_field"),
+    )
 
-    return (
-        f'<div class="featured-rotator-card"'
-        f' data-explore-target="grid-card-{slug}">\n'
-        f'  <div class="featured-rotator-card__hero"'
-        f' style="background: {gradient};">\n'
-        f'    {image_html}\n'
-        f'    <div class="featured-rotator-card__pattern"></div>\n'
-        f'  </div>\n'
-        f'  <div class="featured-rotator-card__body">\n'
-        f'    <p class="featured-rotator-card__title">{title}</p>\n'
-        f'    <span class="featured-rotator-card__field">{research_field}</span>\n'
-        '    <button class="featured-rotator-card__explore-btn"'
-        ' type="button">View in Gallery</button>\n'
-        f'  </div>\n'
-        f'</div>'
+
+# Opt-in build profiling: with NOMAD_GALLERY_PROFILE=<path> (or
+# `gallery_profile: <path>` in the MkDocs `extra` section) the build prints a
+# summary of where its time went and writes it to <path> as JSON, which also
+# loads as a Chrome trace (chrome://tracing, https://ui.perfetto.dev).
+PROFILE_ENV = "NOMAD_GALLERY_PROFILE"
+# Functions timed while profiling: stage name and whether their first argument
+# is a card whose time should be summed per card.
+PROFILED_FUNCTIONS = {
+    "_read_card_info": ("load card", True),
+    "_read_front_matter_from_docs": ("read file", False),
+    "_parse_front_matter": ("parse YAML", False),
+    "_normalize_use_case_info": ("normalize", False),
+    "esc": ("escape HTML", False),
+    "_render_grid_use_case_card": ("render grid card", True),
+    "_render_featured_rotator_card": ("render rotator card", True),
+    "split_card_details": ("split card details", False),
+    "_write_generated_files": ("write generated files", False),
+    "compress_site": ("compress site", False),
+}
+PROFILE_SLOWEST_CARDS = 10
+PROFILE_MAX_TRACE_EVENTS = 200_000
+
+
+class BuildProfiler:
+    """Per-stage timings and counters of a gallery build, off by default.
+
+    ``enable`` replaces the PROFILED_FUNCTIONS in the given module namespace
+    with timed wrappers, so calls made in worker processes are not seen. Each
+    stage records its calls, total time and self time (total minus the time
+    of the stages it called).
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.output = None
+        self._originals = {}
+        self._namespace = None
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        self.stages = {}  # stage -> [calls, total seconds, self seconds]
+        self.counters = {}
+        self.card_times = {}
+        self.events = []
+        self.dropped_events = 0
+        self._origin = time.perf_counter()
+
+    def enable(self, namespace, output):
+        """Start profiling the functions of ``namespace``, reporting to ``output``."""
+        if self.enabled:
+            return
+        self.reset()
+        self.output = output
+        self._namespace = namespace
+        for name, (stage, per_card) in PROFILED_FUNCTIONS.items():
+            self._originals[name] = namespace[name]
+            namespace[name] = self.wrap(stage, namespace[name], per_card)
+        self.enabled = True
+
+    def disable(self):
+        """Restore the original functions."""
+        if self._namespace is not None:
+            self._namespace.update(self._originals)
+        self._originals = {}
+        self._namespace = None
+        self.enabled = False
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def wrap(self, stage, func, per_card=False):
+        """``func`` timed as ``stage``."""
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            stack = self._local.__dict__.setdefault("stack", [])
+            stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                own = elapsed - stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                card = args[0] if per_card and args else None
+                self._record(stage, start, elapsed, own, card)
+
+        return timed
+
+    def wrap_macro(self, name, macro):
+        """A macro timed as a stage, counting the bytes it emits."""
+        timed = self.wrap(f"macro {name}", macro)
+
+        @functools.wraps(macro)
+        def counted(*args, **kwargs):
+            result = timed(*args, **kwargs)
+            self.count("bytes emitted", len(str(result).encode("utf-8")))
+            return result
+
+        return counted
+
+    def _record(self, stage, start, elapsed, own, card):
+        totals = self.stages.setdefault(stage, [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += elapsed
+        totals[2] += own
+        if card is not None:
+            self.card_times[card] = self.card_times.get(card, 0.0) + elapsed
+        if len(self.events) >= PROFILE_MAX_TRACE_EVENTS:
+            self.dropped_events += 1
+            return
+        event = {
+            "name": stage,
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": elapsed * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if card is not None:
+            event["args"] = {"card": str(card)}
+        self.events.append(event)
+
+    def slowest_cards(self, n=PROFILE_SLOWEST_CARDS):
+        """The ``n`` cards that took longest to load and render, in seconds."""
+        return heapq.nlargest(n, self.card_times.items(), key=lambda item: item[1])
+
+    def report(self):
+        """Summary table of the stages, counters and slowest cards."""
+        lines = [f"{'stage':<36} {'calls':>9} {'total s':>9} {'self s':>9}"]
+        for stage, (calls, total, own) in sorted(
+            self.stages.items(), key=lambda item: -item[1][1]
+        ):
+            lines.append(f"{stage:<36} {calls:>9} {total:>9.3f} {own:>9.3f}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<36} {value:>9}")
+        for card, seconds in self.slowest_cards():
+            lines.append(f"{'slowest card':<36} {seconds:>9.4f} {card}")
+        return "\n".join(lines)
+
+    def write(self, path):
+        """Write the profile as JSON with Chrome trace events."""
+        profile = {
+            "stages": {
+                stage: {"calls": calls, "total_s": total, "self_s": own}
+                for stage, (calls, total, own) in self.stages.items()
+            },
+            "counters": self.counters,
+            "slowest_cards": [list(item) for item in self.slowest_cards()],
+            "dropped_events": self.dropped_events,
+            "displayTimeUnit": "ms",
+            "traceEvents": self.events,
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(profile, f)
+
+
+PROFILER = BuildProfiler()
+
+
+def _gallery_settings(extra):
+    """Gallery options of the MkDocs `extra` section."""
+    fragments_dir = extra.get("gallery_fragments_dir")
+    return types.SimpleNamespace(
+        workers=_configured_workers(extra),
+        icon_sprite=bool(extra.get("gallery_icon_sprite", False)),
+        shard_size=int(extra.get("gallery_shard_size", 0) or 0),
+        lazy_details=bool(extra.get("gallery_lazy_details", False)),
+        fragments=FragmentStore(fragments_dir) if fragments_dir else None,
+        profile=os.environ.get(PROFILE_ENV) or extra.get("gallery_profile"),
+        watch=bool(os.environ.get(WATCH_ENV) or extra.get("gallery_watch", False)),
     )
 
 
+def _site_url(env, relative_path):
+    """URL of a site-relative path from the page being rendered."""
+    return "../" * env.page.url.count("/") + relative_path
+
+
+def _define_grid_macros(env, settings):
+    """Macros of the Explore grid: cards, shards, search index and icons."""
+    shards_by_dir = {}
+
+    def collapsed_cards(cards_dir, pieces):
+        dir_key = re.sub(r"[^\w-]+", "-", os.path.normpath(cards_dir)).strip("-")
+
+        def details_path(slug):
+            return f"{DETAILS_DIR}/{dir_key}/{slug}.html"
+
+        for piece in pieces:
+            card, details = split_card_details(
+                piece, lambda slug: _site_url(env, details_path(slug))
+            )
+            if details is not None:
+                slug = _CARD_ID.search(card).group(1)
+                GENERATED_FILES[details_path(slug)] = details
+            yield card
+
+    def sorted_card_pieces(cards_dir):
+        pieces = None
+        if settings.watch:
+            pieces = _watched_sorted_cards(
+                cards_dir, settings.icon_sprite, settings.workers
+            )
+        if pieces is None and settings.fragments is not None:
+            pieces = prebuilt_sorted_cards(
+                settings.fragments, cards_dir, settings.icon_sprite
+            )
+        if pieces is None:
+            pieces = iter_sorted_cards(
+                cards_dir, settings.workers, settings.icon_sprite
+            )
+        if settings.lazy_details:
+            return collapsed_cards(cards_dir, pieces)
+        return pieces
+
+    def sorted_card_shards(cards_dir):
+        if cards_dir not in shards_by_dir:
+            shards_by_dir[cards_dir] = _split_into_shards(
+                sorted_card_pieces(cards_dir), settings.shard_size
+            )
+        return shards_by_dir[cards_dir]
+
+    @env.macro
+    def render_icon_sprite():
+        """The page's SVG <symbol> sprite, when `gallery_icon_sprite` is set."""
+        if not settings.icon_sprite:
+            return ""
+        return f'<div class="gallery-icon-sprite" hidden>{ICON_SPRITE}</div>'
+
+    @env.macro
+    def render_sorted_cards_macro(cards_dir="docs/cards"):
+        if settings.shard_size > 0:
+            return sorted_card_shards(cards_dir)[0]
+        return "".join(sorted_card_pieces(cards_dir))
+
+    @env.macro
+    def render_card_shard_loader(cards_dir="docs/cards"):
+        """'Load more' control fetching the shards after the first one."""
+        if settings.shard_size <= 0:
+            return ""
+        shards = sorted_card_shards(cards_dir)
+        if len(shards) < 2:  # noqa: PLR2004
+            return ""
+
+        name = Path(cards_dir).name
+        urls = []
+        for number, shard in enumerate(shards[1:], start=2):
+            relative_path = f"{CARD_SHARD_DIR}/{name}-{number}.html"
+            GENERATED_FILES[relative_path] = shard
+            urls.append(_site_url(env, relative_path))
+
+        return (
+            '<div class="gallery-shard-loader"'
+            f' data-shard-urls="{esc(json.dumps(urls))}">'
+            '<button class="gallery-filter__action gallery-shard-loader__button"'
+            ' type="button">Load more</button></div>'
+        )
+
+    @env.macro
+    def card_search_index_url(cards_dir="docs/cards"):
+        """Write the search index of a card directory and return its URL."""
+        relative_path = f"{SEARCH_INDEX_DIR}/{Path(cards_dir).name}.json"
+        index = build_search_index(cards_dir, workers=settings.workers)
+        GENERATED_FILES[relative_path] = json.dumps(index, separators=(",", ":"))
+        return _site_url(env, relative_path)
+
+    @env.macro
+    def render_grid_use_case_card(file_path, index=0):
+        return _render_grid_use_case_card(file_path, index, settings.icon_sprite)
+
+
+def _define_facet_macros(env, settings):
+    """Macros of the filter facets, see ``build_facets``."""
+    facets_by_dir = {}
+
+    def card_facets(cards_dir):
+        if cards_dir not in facets_by_dir:
+            facets_by_dir[cards_dir] = build_facets(cards_dir, workers=settings.workers)
+        return facets_by_dir[cards_dir]
+
+    @env.macro
+    def card_facets_url(cards_dir="docs/cards"):
+        """Write the facet counts of a card directory and return their URL."""
+        relative_path = f"{SEARCH_INDEX_DIR}/{Path(cards_dir).name}-facets.json"
+        GENERATED_FILES[relative_path] = json.dumps(
+            card_facets(cards_dir), separators=(",", ":")
+        )
+        return _site_url(env, relative_path)
+
+    @env.macro
+    def render_facet_chips(cards_dir="docs/cards", facet="keywords", limit=12):
+        """Chips of the ``limit`` most common values of a facet, with counts."""
+        entry = card_facets(cards_dir)["facets"][facet]
+        chips = "".join(
+            '<button class="gallery-facets__chip" type="button"'
+            f' data-facet="{esc(facet)}" data-value="{esc(value)}">'
+            f'{esc(value)} <span class="gallery-facets__count">{count}</span>'
+            "</button>"
+            for value, count in zip(entry["values"][:limit], entry["counts"])
+        )
+        return f'<div class="gallery-facets" data-facet="{esc(facet)}">{chips}</div>'
+
+
+def _define_featured_macros(env, settings):
+    """Macros of the featured rotator."""
+    selections = {}
+
+    def featured_cards(cards_dir, k, by, pinned):
+        if (cards_dir, k, by, pinned) not in selections:
+            selections[cards_dir, k, by, pinned] = featured_card_paths(
+                cards_dir, k, by, pinned=pinned, workers=settings.workers
+            )
+        return selections[cards_dir, k, by, pinned]
+
+    @env.macro
+    def render_featured_rotator_card(file_path, index=0):
+        if settings.fragments is not None:
+            found = settings.fragments.get(*_rotator_fragment(file_path, index))
+            if found is not None:
+                _register_fragment_assets(found[1])
+                return found[0]
+        return _render_featured_rotator_card(file_path, index)
+
+    @env.macro
+    def render_featured_rotator_slides(
+        cards_dir="docs/cards", k=3, by="newest", pinned=None
+    ):
+        """Slide sources of the ``k`` featured cards, see ``featured_card_paths``."""
+        selected = featured_cards(cards_dir, k, by, pinned)
+        return "\n".join(
+            '<div class="featured-rotator__slide-source">\n'
+            f"{render_featured_rotator_card(file_path, index)}\n</div>"
+            for index, file_path in enumerate(selected)
+        )
+
+    @env.macro
+    def render_featured_rotator_dots(
+        cards_dir="docs/cards", k=3, by="newest", pinned=None
+    ):
+        """Navigation dots matching ``render_featured_rotator_slides``."""
+        return "\n".join(
+            f'<button class="featured-rotator__dot{" is-active" if i == 0 else ""}"'
+            f' type="button" aria-label="Go to slide {i + 1}"></button>'
+            for i in range(len(featured_cards(cards_dir, k, by, pinned)))
+        )
+
+
 def define_env(env):
     """Define macros for MkDocs."""
+    extra = env.conf.get("extra") or {}
+    settings = _gallery_settings(extra)
+    CARD_IMAGES.enabled = bool(extra.get("gallery_image_cache", False))
+    if settings.profile:
+        PROFILER.enable(globals(), settings.profile)
 
     @env.macro
     def include_raw_markdown(file_path):
@@ -581,14 +2592,651 @@ def define_env(env):
         except Exception as e:
             return f"**Error loading file {file_path}: {str(e)}**"
 
-    @env.macro
-    def render_sorted_cards_macro(cards_dir="docs/cards"):
-        return render_sorted_cards(cards_dir)
+    _define_grid_macros(env, settings)
+    _define_facet_macros(env, settings)
+    _define_featured_macros(env, settings)
 
-    @env.macro
-    def render_featured_rotator_card(file_path, index=0):
-        return _render_featured_rotator_card(file_path, index)
+    if PROFILER.enabled:
+        for name, macro in list(env.macros.items()):
+            env.macro(PROFILER.wrap_macro(name, macro), name)
 
-    @env.macro
-    def render_grid_use_case_card(file_path, index=0):
-        return _render_grid_use_case_card(file_path, index)
+
+def on_post_build(env):
+    """Persist the card cache, write generated files and compress the site."""
+    for slug, file_paths in CARD_REGISTRY.slug_conflicts().items():
+        print(
+            f"WARNING cards {', '.join(file_paths)} differ but share the id "
+            f"grid-card-{slug}; rotator links to it may open the wrong card"
+        )
+    CARD_REGISTRY.save()
+    CARD_IMAGES.prune(GENERATED_FILES.values())
+    CARD_IMAGES.save()
+    _write_generated_files(env.conf["site_dir"])
+    extra = env.conf.get("extra") or {}
+    if extra.get("gallery_compress", False):
+        compress_site(env.conf["site_dir"], _configured_workers(extra))
+    if PROFILER.enabled:
+        print(PROFILER.report())
+        PROFILER.write(PROFILER.output)
+        PROFILER.disable()
+
+
+# `python main.py validate-cards` checks card front matter against the
+# quantities of GalleryEntry, read from the schema source so that the check
+# does not need NOMAD installed.
+SCHEMA_PACKAGE_PATH = Path(__file__).with_name("src").joinpath(
+    "nomad_gallery", "schema_packages", "schema_package.py"
+)
+# Card keys stored under a different GalleryEntry quantity.
+CARD_FIELD_ALIASES = {"title": "name"}
+# Card keys that are not GalleryEntry quantities but are read by the gallery,
+# with their kind.
+CARD_ONLY_FIELDS = {
+    "submitter": "str",
+    "submitted_by": "str",
+    "submission_date": "date",
+    "submitted_date": "date",
+    "summary": "str",
+    "image": "image",
+    "image_name": "str",
+    "image_path": "image",
+    "repo_link": "url",
+    "repository_reference": "url",
+    "repo_name": "str",
+    "entry_link": "url",
+    "external_url": "url",
+    "entry_name": "str",
+    "dataset_reference": "str",
+    "specific_technique": "str",
+}
+URL_QUANTITIES = {"media_url"}
+# UseCaseInfo fields a card must set under one of their USE_CASE_SOURCES keys.
+REQUIRED_CARD_FIELDS = ("title", "submission_date")
+DOI_PATTERN = re.compile(r"^(doi:\s*)?10\.\d{4,9}/\S+$", re.IGNORECASE)
+
+
+@functools.cache
+def _schema_constants(schema_path=SCHEMA_PACKAGE_PATH):
+    """Module-level literals of the schema package, such as METHODOLOGY_TYPES."""
+    constants = {}
+    for node in ast.parse(Path(schema_path).read_text(encoding="utf-8")).body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            with contextlib.suppress(ValueError, TypeError, SyntaxError):
+                constants[getattr(node.targets[0], "id", None)] = ast.literal_eval(
+                    node.value
+                )
+    return constants
+
+
+def _coerce_methodology(value):
+    """Map a methodology_type spelling to its MEnum value (others are kept)."""
+    lookup = _schema_constants().get("METHODOLOGY_LOOKUP", {})
+    return lookup.get(" ".join(str(value).split()).casefold(), value)
+
+
+@functools.cache
+def _gallery_entry_quantities(schema_path=SCHEMA_PACKAGE_PATH):
+    """Map GalleryEntry quantity names to ``(kind, enum_values, is_list)``."""
+    tree = ast.parse(Path(schema_path).read_text(encoding="utf-8"))
+    constants = _schema_constants(schema_path)
+    quantities = {}
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.ClassDef) and node.name == "GalleryEntry"):
+            continue
+        for statement in node.body:
+            if not (
+                isinstance(statement, ast.Assign)
+                and isinstance(statement.value, ast.Call)
+                and getattr(statement.value.func, "id", None) == "Quantity"
+            ):
+                continue
+            keywords = {kw.arg: kw.value for kw in statement.value.keywords}
+            kind, enum_values = "str", None
+            quantity_type = keywords.get("type")
+            if isinstance(quantity_type, ast.Name):
+                kind = quantity_type.id
+            elif isinstance(quantity_type, ast.Call):
+                kind = "enum"
+                enum_values = ()
+                for arg in quantity_type.args:
+                    if isinstance(arg, ast.Starred):
+                        enum_values += tuple(constants[arg.value.id])
+                    else:
+                        enum_values += (ast.literal_eval(arg),)
+            for target in statement.targets:
+                quantities[target.id] = (kind, enum_values, "shape" in keywords)
+    return quantities
+
+
+def _is_url(value):
+    parts = urllib.parse.urlsplit(value)
+    return parts.scheme in ("http", "https") and bool(parts.netloc)
+
+
+def _check_date_value(value):
+    if isinstance(value, date):
+        return None
+    try:
+        datetime.strptime(str(value), "%Y-%m-%d")
+    except ValueError:
+        return "error", f"{value!r} is not a YYYY-MM-DD date"
+    return None
+
+
+def _check_int_value(value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return ("error", f"{value} is negative") if value < 0 else None
+    if isinstance(value, str) and value.replace(",", "").strip().isdigit():
+        return "warning", f"{value!r} is a quoted integer"
+    return "error", f"{value!r} is not an integer"
+
+
+def _check_enum_value(key, text, enum_values):
+    spelling = _coerce_methodology(text) if key == "methodology_type" else None
+    if spelling in enum_values:
+        return "warning", f"{text!r} should be spelled {spelling!r}"
+    return "error", f"{text!r} is not one of {', '.join(enum_values)}"
+
+
+def _check_text_value(key, text, kind, enum_values):
+    if not text:
+        return None
+    if kind == "enum" and text not in enum_values:
+        return _check_enum_value(key, text, enum_values)
+    if (kind == "url" or (kind == "image" and "://" in text)) and not _is_url(text):
+        return "error", f"{text!r} is not an http(s) URL"
+    if kind == "image" and "://" not in text and not Path("docs", text).exists():
+        return "warning", f"image {text!r} does not exist under docs/"
+    if key == "publication_reference" and not (
+        _is_url(text) or DOI_PATTERN.match(text)
+    ):
+        return "warning", f"{text!r} is neither a DOI nor an http(s) URL"
+    return None
+
+
+def _check_card_value(key, value, kind, enum_values=None):
+    """Return ``(severity, message)`` for a bad front matter value, or None."""
+    if kind == "date":
+        return _check_date_value(value)
+    if kind == "int":
+        return _check_int_value(value)
+    if not isinstance(value, str):
+        return "error", f"expected text, got {type(value).__name__}"
+    return _check_text_value(key, value.strip(), kind, enum_values)
+
+
+def validate_card(file_path):
+    """Check one docs-relative card; return a list of ``(severity, field, msg)``."""
+    return _check_card(file_path)[0]
+
+
+def _check_card(file_path):
+    """Issues of one card and its front matter's repr (None if unreadable)."""
+    try:
+        data, _ = _read_front_matter_from_docs(file_path, with_body=False)
+    except Exception as e:
+        return [("error", "", str(e))], None
+    if not isinstance(data, dict):
+        return [("error", "", "front matter is not a mapping")], None
+
+    quantities = _gallery_entry_quantities()
+    issues = [
+        ("error", field, "required field is missing")
+        for field in REQUIRED_CARD_FIELDS
+        if all(data.get(key) in (None, "") for key in USE_CASE_SOURCES[field])
+    ]
+    for key, value in data.items():
+        if value is None:
+            continue
+        quantity = quantities.get(CARD_FIELD_ALIASES.get(key, key))
+        if quantity is not None:
+            kind, enum_values, is_list = quantity
+            if key in URL_QUANTITIES:
+                kind = "url"
+        elif key in CARD_ONLY_FIELDS:
+            kind, enum_values, is_list = CARD_ONLY_FIELDS[key], None, False
+        else:
+            issues.append(("warning", key, "unknown field, not in GalleryEntry"))
+            continue
+
+        # Lists may also be given as comma separated text.
+        values = value if is_list and isinstance(value, list) else [value]
+        for item in values:
+            problem = _check_card_value(key, item, kind, enum_values)
+            if problem is not None:
+                issues.append((problem[0], key, problem[1]))
+    return issues, repr(data)
+
+
+def validate_cards(file_paths, workers=0):
+    """Yield ``(file_path, issues)`` for each card, in order, as they are checked."""
+    for file_path, issues, _ in _check_cards(file_paths, workers):
+        yield file_path, issues
+
+
+def _check_cards(file_paths, workers=0):
+    """Yield ``(file_path, issues, front_matter_repr)`` for each card, in order."""
+    if workers > 1 and len(file_paths) > 1:
+        _make_importable_for_workers()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            checked = pool.map(
+                _check_card,
+                file_paths,
+                chunksize=max(1, len(file_paths) // (workers * 4)),
+            )
+            for file_path, (issues, front_matter) in zip(file_paths, checked):
+                yield file_path, issues, front_matter
+    else:
+        for file_path in file_paths:
+            yield file_path, *_check_card(file_path)
+
+
+def _slug_conflict_issues(front_matter_by_path):
+    """Warnings for cards with differing front matter that share a slug."""
+    by_slug = {}
+    for file_path, front_matter in front_matter_by_path.items():
+        if front_matter is not None:
+            by_slug.setdefault(_card_slug(file_path), []).append(file_path)
+    issues = {}
+    for slug, paths in by_slug.items():
+        if len({front_matter_by_path[path] for path in paths}) < 2:  # noqa: PLR2004
+            continue
+        for file_path in paths:
+            others = ", ".join(other for other in paths if other != file_path)
+            issues[file_path] = (
+                "warning",
+                "",
+                f"differs from {others} but shares its id grid-card-{slug}",
+            )
+    return issues
+
+
+def _validation_report_json(results):
+    errors = sum(s == "error" for _, issues in results for s, _, _ in issues)
+    return {
+        "cards": len(results),
+        "errors": errors,
+        "warnings": sum(len(issues) for _, issues in results) - errors,
+        "results": [
+            {
+                "file": file_path,
+                "issues": [
+                    {"severity": severity, "field": field, "message": message}
+                    for severity, field, message in issues
+                ],
+            }
+            for file_path, issues in results
+        ],
+    }
+
+
+def _validation_report_junit(results):
+    suite = ElementTree.Element(
+        "testsuite",
+        name="nomad-gallery cards",
+        tests=str(len(results)),
+        failures=str(
+            sum(any(s == "error" for s, _, _ in issues) for _, issues in results)
+        ),
+    )
+    for file_path, issues in results:
+        case = ElementTree.SubElement(
+            suite, "testcase", classname="cards", name=file_path
+        )
+        errors = [f"{f}: {m}" if f else m for s, f, m in issues if s == "error"]
+        if errors:
+            failure = ElementTree.SubElement(
+                case, "failure", message=f"{len(errors)} error(s)"
+            )
+            failure.text = "\n".join(errors)
+        warnings = [f"{f}: {m}" for s, f, m in issues if s == "warning"]
+        if warnings:
+            ElementTree.SubElement(case, "system-out").text = "\n".join(warnings)
+    return ElementTree.tostring(suite, encoding="unicode")
+
+
+def _print_card_issues(file_path, issues):
+    for severity, field, message in issues:
+        location = f"{file_path}: {field}" if field else file_path
+        print(f"{severity.upper()} {location}: {message}")
+
+
+def validate_cards_command(argv=None):
+    """Validate card front matter against GalleryEntry without building the site."""
+    parser = argparse.ArgumentParser(
+        prog="main.py validate-cards", description=validate_cards_command.__doc__
+    )
+    parser.add_argument(
+        "--cards-dir",
+        action="append",
+        help="card directory (repeatable, default docs/cards and docs/special_cards)",
+    )
+    parser.add_argument(
+        "--jobs", type=int, help=f"worker processes (default: {CARD_WORKERS_ENV})"
+    )
+    parser.add_argument("--json", metavar="PATH", help="write a JSON report")
+    parser.add_argument("--junit", metavar="PATH", help="write a JUnit XML report")
+    args = parser.parse_args(argv)
+
+    jobs = args.jobs if args.jobs is not None else _configured_workers()
+    file_paths = []
+    for cards_dir in args.cards_dir or ["docs/cards", "docs/special_cards"]:
+        if os.path.exists(cards_dir):
+            file_paths += sorted(_card_file_paths(cards_dir))
+
+    results = []
+    front_matter_by_path = {}
+    for file_path, issues, front_matter in _check_cards(file_paths, jobs):
+        results.append((file_path, issues))
+        front_matter_by_path[file_path] = front_matter
+        _print_card_issues(file_path, issues)
+    # Slug conflicts are only known once every card has been checked.
+    conflicts = _slug_conflict_issues(front_matter_by_path)
+    for file_path, issues in results:
+        if file_path in conflicts:
+            issues.append(conflicts[file_path])
+            _print_card_issues(file_path, [conflicts[file_path]])
+
+    report = _validation_report_json(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.junit:
+        with open(args.junit, "w", encoding="utf-8") as f:
+            f.write(_validation_report_junit(results))
+
+    print(
+        f"Checked {report['cards']} card(s): "
+        f"{report['errors']} error(s), {report['warnings']} warning(s)"
+    )
+    return 1 if report["errors"] else 0
+
+
+# `python main.py import-archives` turns GalleryEntry archives into cards.
+ARCHIVE_SUFFIXES = (".archive.yaml", ".archive.yml", ".archive.json")
+ARCHIVE_BATCH_SIZE = 256
+
+
+def _archive_files(paths):
+    """Yield the archive files given directly or found below directories."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, filenames in sorted(os.walk(path)):
+                for filename in sorted(filenames):
+                    if filename.endswith(ARCHIVE_SUFFIXES):
+                        yield os.path.join(root, filename)
+        else:
+            yield path
+
+
+def _read_gallery_entry(archive_path):
+    """``(data, metadata)`` of a GalleryEntry archive; ValueError for others."""
+    with open(archive_path, encoding="utf-8") as f:
+        if archive_path.endswith(".json"):
+            archive = json.load(f)
+        else:
+            archive = yaml.load(f, Loader=YamlLoader)
+    if archive is None:
+        archive = {}
+    if not isinstance(archive, dict):
+        raise ValueError("archive is not a mapping")
+    data = archive.get("data")
+    metadata = archive.get("metadata") or {}
+    for field, value in (("data", data), ("metadata", metadata)):
+        if value is not None and not isinstance(value, dict):
+            raise ValueError(f"{field} is not a mapping")
+    if data is None or not str(data.get("m_def", "")).endswith("GalleryEntry"):
+        raise ValueError("not a GalleryEntry archive")
+    return data, metadata
+
+
+def _card_from_archive(archive_path):
+    """Read one archive into ``(card_name, front_matter, error_message)``."""
+    try:
+        data, metadata = _read_gallery_entry(archive_path)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        return None, None, str(e)
+
+    quantities = _gallery_entry_quantities()
+    front_matter = {}
+    if data.get("name") is not None:
+        front_matter["title"] = data["name"]
+    for key, value in data.items():
+        if key != "name" and key in quantities and value is not None:
+            front_matter[key] = value
+    if "methodology_type" in front_matter:
+        front_matter["methodology_type"] = _coerce_methodology(
+            front_matter["methodology_type"]
+        )
+    author = metadata.get("main_author")
+    if isinstance(author, dict) and author.get("name"):
+        front_matter["submitter"] = author["name"]
+    created = metadata.get("entry_create_time") or metadata.get("upload_create_time")
+    if created:
+        front_matter["submission_date"] = str(created)[:10]
+
+    name = metadata.get("entry_id") or os.path.basename(archive_path)
+    for suffix in ARCHIVE_SUFFIXES:
+        name = name.removesuffix(suffix)
+    return f"archive-{_card_slug(name)}", front_matter, None
+
+
+def _dump_front_matter(front_matter):
+    return yaml.dump(
+        front_matter, Dumper=YamlDumper, sort_keys=False, allow_unicode=True
+    )
+
+
+def _write_archive_card(cards_dir, name, front_matter):
+    """Write or update one imported card; return "new", "updated" or "unchanged".
+
+    Archives without a creation time keep the submission date of an earlier
+    import (or get today's date), so re-importing the same archive leaves the
+    card byte for byte unchanged.
+    """
+    card_path = Path(cards_dir, f"{name}.md")
+    if "submission_date" not in front_matter:
+        previous = ""
+        if card_path.exists():
+            with contextlib.suppress(Exception):
+                previous = _read_front_matter_from_docs(
+                    str(card_path.resolve().relative_to(Path("docs").resolve())),
+                    with_body=False,
+                )[0].get("submission_date", "")
+        front_matter["submission_date"] = str(previous or date.today())
+
+    text = (
+        f"{FRONT_MATTER_DELIMITER}\n{_dump_front_matter(front_matter)}"
+        f"{FRONT_MATTER_DELIMITER}\n"
+    )
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    if card_path.exists():
+        if _file_digest(card_path) == digest:
+            return "unchanged"
+        status = "updated"
+    else:
+        status = "new"
+    card_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = card_path.with_name(f".{card_path.name}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, card_path)
+    return status
+
+
+def import_archives(paths, cards_dir="docs/cards", workers=0):
+    """Convert GalleryEntry archives into cards, yielding ``(archive, status)``.
+
+    Archives are read in batches of ARCHIVE_BATCH_SIZE, in a process pool when
+    ``workers`` > 1. The status is "new", "updated", "unchanged" or an error
+    message. Written cards are registered in CARD_REGISTRY directly when
+    ``cards_dir`` lies below docs/.
+    """
+    docs_dir = Path("docs").resolve()
+    pool = None
+    if workers > 1:
+        _make_importable_for_workers()
+        pool = ProcessPoolExecutor(max_workers=workers)
+
+    seen = {}
+    archives = _archive_files(paths)
+    try:
+        while batch := list(itertools.islice(archives, ARCHIVE_BATCH_SIZE)):
+            if pool is not None:
+                chunksize = max(1, len(batch) // (workers * 4))
+                cards = pool.map(_card_from_archive, batch, chunksize=chunksize)
+            else:
+                cards = map(_card_from_archive, batch)
+
+            for archive_path, (name, front_matter, error) in zip(batch, cards):
+                if error is not None:
+                    yield archive_path, error
+                    continue
+                if name in seen:
+                    yield archive_path, f"same card name as {seen[name]}"
+                    continue
+                seen[name] = archive_path
+                status = _write_archive_card(cards_dir, name, front_matter)
+                card_path = Path(cards_dir, f"{name}.md").resolve()
+                if status != "unchanged" and card_path.is_relative_to(docs_dir):
+                    # Round-trip through YAML so the info equals a parsed card.
+                    data = yaml.load(_dump_front_matter(front_matter), YamlLoader)
+                    CARD_REGISTRY.put(
+                        str(card_path.relative_to(docs_dir)),
+                        _normalize_use_case_info(data),
+                    )
+                yield archive_path, status
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def import_archives_command(argv=None):
+    """Create or update cards from NOMAD GalleryEntry archive files."""
+    parser = argparse.ArgumentParser(
+        prog="main.py import-archives", description=import_archives_command.__doc__
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="archive files or directories to search"
+    )
+    parser.add_argument(
+        "--output", default="docs/cards", help="card directory (default docs/cards)"
+    )
+    parser.add_argument(
+        "--jobs", type=int, help=f"worker processes (default: {CARD_WORKERS_ENV})"
+    )
+    args = parser.parse_args(argv)
+
+    jobs = args.jobs if args.jobs is not None else _configured_workers()
+    counts = {"new": 0, "updated": 0, "unchanged": 0, "failed": 0}
+    for archive_path, status in import_archives(args.paths, args.output, jobs):
+        if status in counts:
+            counts[status] += 1
+        else:
+            counts["failed"] += 1
+            print(f"Error importing {archive_path}: {status}")
+    CARD_REGISTRY.save()
+
+    print(
+        f"Imported {sum(counts.values())} archive(s): {counts['new']} new, "
+        f"{counts['updated']} updated, {counts['unchanged']} unchanged, "
+        f"{counts['failed']} failed"
+    )
+    return 1 if counts["failed"] else 0
+
+
+def _mkdocs_extra(config_path):
+    """The `extra` section of an MkDocs config, or {} if it cannot be read."""
+    try:
+        with open(config_path, encoding="utf-8") as f:
+            config = yaml.load(f, Loader=YamlLoader) or {}
+    except (OSError, yaml.YAMLError):
+        return {}
+    return config.get("extra") or {}
+
+
+def build_cards(argv=None):
+    """Prebuild the card grid and rotator fragments outside of MkDocs."""
+    parser = argparse.ArgumentParser(
+        prog="main.py build-cards", description=build_cards.__doc__
+    )
+    parser.add_argument(
+        "--config", default="mkdocs.yml", help="MkDocs config providing `extra`"
+    )
+    parser.add_argument(
+        "--cards-dir",
+        action="append",
+        help="card directory rendered as a grid (repeatable, default docs/cards)",
+    )
+    parser.add_argument(
+        "--rotator",
+        action="append",
+        metavar="CARD",
+        help="docs-relative rotator card (repeatable, default: those of index.md)",
+    )
+    parser.add_argument(
+        "--jobs", type=int, help=f"worker processes (default: {CARD_WORKERS_ENV})"
+    )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="skip fragments whose cards did not change",
+    )
+    parser.add_argument(
+        "--output", help=f"fragment directory (default: {FRAGMENTS_DIR})"
+    )
+    args = parser.parse_args(argv)
+
+    extra = _mkdocs_extra(args.config)
+    jobs = args.jobs if args.jobs is not None else _configured_workers(extra)
+    icon_sprite = bool(extra.get("gallery_icon_sprite", False))
+    CARD_IMAGES.enabled = bool(extra.get("gallery_image_cache", False))
+    store = FragmentStore(
+        args.output or extra.get("gallery_fragments_dir") or FRAGMENTS_DIR
+    )
+    rotator_cards = (
+        list(enumerate(args.rotator))
+        if args.rotator
+        else [(index, path) for path, index in _featured_rotator_cards()]
+    )
+
+    start = time.perf_counter()
+    built = skipped = 0
+    for cards_dir in args.cards_dir or ["docs/cards"]:
+        if build_grid_fragment(
+            store,
+            cards_dir,
+            jobs,
+            icon_sprite=icon_sprite,
+            changed_only=args.changed_only,
+        ):
+            built += 1
+        else:
+            skipped += 1
+    for index, file_path in rotator_cards:
+        if build_rotator_fragment(store, file_path, index, args.changed_only):
+            built += 1
+        else:
+            skipped += 1
+    store.save()
+    CARD_REGISTRY.save()
+    CARD_IMAGES.save()
+
+    print(
+        f"Built {built} fragment(s), {skipped} unchanged, in {store.path} "
+        f"({time.perf_counter() - start:.2f}s)"
+    )
+    return 0
+
+
+COMMANDS = {
+    "build-cards": build_cards,
+    "validate-cards": validate_cards_command,
+    "import-archives": import_archives_command,
+}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS:  # noqa: PLR2004
+        print(f"usage: python main.py {{{','.join(COMMANDS)}}} [options]")
+        sys.exit(2)
+    sys.exit(COMMANDS[sys.argv[1]](sys.argv[2:]))
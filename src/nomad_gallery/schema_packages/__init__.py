@@ -1,13 +1,14 @@
 from nomad.config.models.plugins import SchemaPackageEntryPoint
 from pydantic import Field
 
-from nomad_gallery.schema_packages.schema_package import m_package
-
 
 class NewSchemaPackageEntryPoint(SchemaPackageEntryPoint):
     parameter: int = Field(0, description='Custom configuration parameter')
 
     def load(self):
+        # Imported here so plugin discovery does not build the metainfo.
+        from nomad_gallery.schema_packages.schema_package import m_package  # noqa: PLC0415
+
         return m_package
 
 
@@ -1,3 +1,4 @@
+import re
 from typing import (
     TYPE_CHECKING,
 )
@@ -20,6 +21,67 @@ from nomad.metainfo import MEnum, Quantity, SchemaPackage
 
 m_package = SchemaPackage()
 
+METHODOLOGY_TYPES = ('Computational', 'Experimental', 'Mixed/Hybrid')
+# Accepted spellings of methodology_type, keyed by their casefolded form. The
+# MEnum rejects anything else, so raw card and archive values are mapped with
+# this by the gallery's import-archives and validate-cards commands (main.py
+# reads it as a literal).
+METHODOLOGY_LOOKUP = {
+    'computational': 'Computational',
+    'experimental': 'Experimental',
+    'mixed/hybrid': 'Mixed/Hybrid',
+    'mixed': 'Mixed/Hybrid',
+    'hybrid': 'Mixed/Hybrid',
+    'both': 'Mixed/Hybrid',
+}
+# Single-line text quantities; the rich-text description is left untouched.
+TEXT_QUANTITIES = (
+    'name',
+    'research_field',
+    'institution',
+    'country',
+    'technique',
+    'data_size',
+    'publication_reference',
+    'funding_reference',
+    'media_url',
+)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def clean_text(value):
+    """Collapse runs of whitespace into single spaces and strip the ends."""
+    return _WHITESPACE.sub(' ', str(value)).strip()
+
+
+def split_items(values):
+    """Clean a list of items, splitting each of them (or a string) at commas."""
+    if isinstance(values, str):
+        values = [values]
+    return [
+        item
+        for value in values
+        for item in (clean_text(part) for part in str(value).split(','))
+        if item
+    ]
+
+
+def canonical_keywords(keywords, spellings):
+    """Drop case-insensitive duplicate keywords.
+
+    ``spellings`` maps casefolded keywords to the spelling used for them; it is
+    filled with the first spelling seen, so sharing it between entries gives
+    them all the same spelling.
+    """
+    result = []
+    seen = set()
+    for keyword in split_items(keywords):
+        key = keyword.casefold()
+        if key not in seen:
+            seen.add(key)
+            result.append(spellings.setdefault(key, keyword))
+    return result
+
 
 class GalleryEntry(Schema):
     """
@@ -72,7 +134,7 @@ class GalleryEntry(Schema):
 
     # 4. Methodology
     methodology_type = Quantity(
-        type=MEnum('Computational', 'Experimental', 'Mixed/Hybrid'),
+        type=MEnum(*METHODOLOGY_TYPES),
         description='Whether the work is primarily\
               computational, experimental, or both.',
         a_eln=ELNAnnotation(component=ELNComponentEnum.EnumEditQuantity),
@@ -131,11 +193,50 @@ class GalleryEntry(Schema):
         a_eln=ELNAnnotation(component=ELNComponentEnum.StringEditQuantity),
     )
 
+    def canonicalize(self, keyword_spellings: dict | None = None) -> None:
+        """
+        Canonicalize the entry in place, like the gallery cards are: whitespace
+        in text quantities, comma separated coauthors and case-insensitively
+        unique keywords. Only changed quantities are set again.
+        """
+        for quantity in TEXT_QUANTITIES:
+            value = getattr(self, quantity)
+            if value is not None and clean_text(value) != value:
+                setattr(self, quantity, clean_text(value))
+
+        if self.coauthors is not None:
+            coauthors = split_items(self.coauthors)
+            if coauthors != list(self.coauthors):
+                self.coauthors = coauthors
+        if self.keywords is not None:
+            keywords = canonical_keywords(
+                self.keywords, {} if keyword_spellings is None else keyword_spellings
+            )
+            if keywords != list(self.keywords):
+                self.keywords = keywords
+
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
+        self.canonicalize()
+        logger.debug('GalleryEntry.normalize', name=self.name)
 
-        # Log the normalization for debugging
-        logger.info('GalleryEntry.normalize', name=self.name)
+
+def normalize_gallery_entries(archives, logger: 'BoundLogger' = None) -> list:
+    """
+    Canonicalize the GalleryEntry of many archives (or the sections
+    themselves) in one pass. Keyword spellings are shared across the batch.
+    Returns the canonicalized entries; other archives are skipped.
+    """
+    keyword_spellings = {}
+    entries = []
+    for archive in archives:
+        entry = getattr(archive, 'data', archive)
+        if isinstance(entry, GalleryEntry):
+            entry.canonicalize(keyword_spellings)
+            entries.append(entry)
+    if logger is not None:
+        logger.debug('normalize_gallery_entries', entries=len(entries))
+    return entries
 
 
 m_package.__init_metainfo__()
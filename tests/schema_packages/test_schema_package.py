@@ -1,6 +1,15 @@
 import os.path
+import subprocess
+import sys
 
 from nomad.client import normalize_all, parse
+from nomad.datamodel import EntryArchive
+
+from nomad_gallery.schema_packages import schema_package_entry_point
+from nomad_gallery.schema_packages.schema_package import (
+    GalleryEntry,
+    normalize_gallery_entries,
+)
 
 
 def test_schema_package():
@@ -12,3 +21,58 @@ def test_schema_package():
     assert entry_archive.data.name == 'Test Gallery Entry'
     assert entry_archive.data.research_field == 'Battery Science'
     assert entry_archive.data.institution == 'Test Institute'
+
+
+def test_normalize_gallery_entries():
+    entries = [
+        GalleryEntry(
+            name='  Spaced   Name ',
+            keywords=['DFT', 'batteries', 'dft', ' Batteries '],
+            coauthors=['Jane Doe', ' ', 'John  Roe, Max Mustermann'],
+        ),
+        GalleryEntry(name='Other', keywords=['Batteries, DFT', 'ML,']),
+    ]
+    archives = [EntryArchive(data=entry) for entry in entries]
+
+    normalized = normalize_gallery_entries([*archives, EntryArchive()])
+
+    assert normalized == entries
+    assert entries[0].name == 'Spaced Name'
+    assert entries[0].keywords == ['DFT', 'batteries']
+    assert entries[0].coauthors == ['Jane Doe', 'John Roe', 'Max Mustermann']
+    # The first spelling of a keyword wins across the whole batch.
+    assert entries[1].keywords == ['batteries', 'DFT', 'ML']
+
+
+# Self time of the nomad_gallery modules when the entry point is imported, in us.
+ENTRY_POINT_IMPORT_BUDGET = 50_000
+
+
+def test_entry_point_import_is_lazy():
+    result = subprocess.run(
+        [
+            sys.executable,
+            '-X',
+            'importtime',
+            '-c',
+            'import nomad_gallery.schema_packages',
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like "import time:  self [us] | cumulative | imported package".
+    timings = {}
+    for line in result.stderr.splitlines():
+        fields = line.removeprefix('import time:').split('|')
+        if len(fields) == 3 and fields[0].strip().isdigit():  # noqa: PLR2004
+            timings[fields[2].strip()] = int(fields[0])
+
+    assert 'nomad_gallery.schema_packages' in timings
+    assert 'nomad_gallery.schema_packages.schema_package' not in timings
+    own_time = sum(t for name, t in timings.items() if name.startswith('nomad_gallery'))
+    assert own_time < ENTRY_POINT_IMPORT_BUDGET
+
+
+def test_entry_point_load():
+    assert schema_package_entry_point.load().section_definitions
@@ -0,0 +1,878 @@
+import base64
+import functools
+import gzip
+import http.server
+import io
+import json
+import re
+import threading
+from pathlib import Path
+
+import pytest
+
+import main
+
+CARD = """---
+title: {title}
+submitter: Test Submitter
+description: A synthetic card.
+submission_date: {date}
+keywords:
+  - Alpha
+  - Beta
+---
+"""
+
+
+# A 40x20 PNG.
+PNG = base64.b64decode(
+    'iVBORw0KGgoAAAANSUhEUgAAACgAAAAUCAIAAABwJOjsAAAAJ0lEQVR4nGPkEpFjGAjANCC2jlo8avGo'
+    'xaMWj1o8avGoxaMWDwgAAP1GAGQekqhiAAAAAElFTkSuQmCC'
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cards(tmp_path, monkeypatch):
+    """Give each test its own card registry, card cache and serve state."""
+    state = main._SERVE_STATE
+    for name in ('card_infos', 'rendered_cards', 'rendered_card_keys', 'card_indexes'):
+        monkeypatch.setattr(state, name, {})
+    monkeypatch.setattr(state, 'card_watchers', {})
+    registry = main.CardRegistry(
+        cache=main.CardCache(str(tmp_path / 'card-info.json')),
+        entries=state.card_infos,
+    )
+    monkeypatch.setattr(main, 'CARD_REGISTRY', registry)
+    yield registry
+    for observer, _ in state.card_watchers.values():
+        observer.stop()
+        observer.join()
+
+
+def write_card(docs_dir, name, title='Test Card', date='2025-01-01'):
+    card = docs_dir / 'cards' / name
+    card.parent.mkdir(parents=True, exist_ok=True)
+    card.write_text(CARD.format(title=title, date=date), encoding='utf-8')
+    return card
+
+
+def test_card_registry_parses_each_card_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_card(tmp_path / 'docs', 'one.md', title='First')
+    registry = main.CardRegistry()
+
+    calls = []
+    original = main._read_front_matter_from_docs
+
+    def counting_reader(file_path, **kwargs):
+        calls.append(file_path)
+        return original(file_path, **kwargs)
+
+    monkeypatch.setattr(main, '_read_front_matter_from_docs', counting_reader)
+
+    assert registry.get('cards/one.md')['title'] == 'First'
+    assert registry.get('cards/one.md')['keywords'] == ['Alpha', 'Beta']
+    assert calls == ['cards/one.md']
+
+    registry.invalidate('cards/one.md')
+    registry.get('cards/one.md')
+    assert len(calls) == 2  # noqa: PLR2004
+
+
+def test_identical_cards_are_parsed_and_rendered_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    docs_dir = tmp_path / 'docs'
+    card = write_card(docs_dir, 'shared.md', title='Shared')
+    copy = docs_dir / 'special_cards' / 'shared.md'
+    copy.parent.mkdir()
+    copy.write_text(card.read_text())
+
+    parsed, rendered = [], []
+    read_card_info = main._read_card_info
+    render = main._render_grid_use_case_card
+    monkeypatch.setattr(
+        main,
+        '_read_card_info',
+        lambda path: parsed.append(path) or read_card_info(path),
+    )
+    monkeypatch.setattr(
+        main,
+        '_render_grid_use_case_card',
+        lambda path, *args: rendered.append(path) or render(path, *args),
+    )
+
+    grid = main.render_sorted_cards('docs/cards', workers=0)
+    assert main.render_sorted_cards('docs/special_cards', workers=0) == grid
+    assert parsed == ['cards/shared.md']
+    assert rendered == ['cards/shared.md']
+    assert main.CARD_REGISTRY.slug_conflicts() == {}
+    report = tmp_path / 'report.json'
+    assert main.validate_cards_command(['--jobs', '0', '--json', str(report)]) == 0
+    assert json.loads(report.read_text())['warnings'] == 0
+
+    copy.write_text(CARD.format(title='Diverged', date='2025-01-01'))
+    main.render_sorted_cards('docs/special_cards', workers=0)
+    assert main.CARD_REGISTRY.slug_conflicts() == {
+        'shared': ['cards/shared.md', 'special_cards/shared.md']
+    }
+
+    # validate-cards finds the conflict without parsing cards into the registry.
+    parsed.clear()
+    main.CARD_REGISTRY.invalidate()
+    for jobs in ('0', '2'):
+        assert main.validate_cards_command(['--jobs', jobs, '--json', str(report)]) == 0
+        assert json.loads(report.read_text())['warnings'] == 2  # noqa: PLR2004
+    assert parsed == []
+
+
+def test_card_registry_picks_up_edits(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    card = write_card(tmp_path / 'docs', 'one.md', title='First')
+    registry = main.CardRegistry()
+    assert registry.get('cards/one.md')['title'] == 'First'
+
+    card.write_text(CARD.format(title='Edited title', date='2025-01-01'))
+    assert registry.get('cards/one.md')['title'] == 'Edited title'
+
+
+def test_card_parse_errors_are_cached_until_the_card_changes(
+    tmp_path, monkeypatch, capsys
+):
+    monkeypatch.chdir(tmp_path)
+    write_card(tmp_path / 'docs', 'good.md')
+    broken = tmp_path / 'docs' / 'cards' / 'broken.md'
+    broken.write_text('no front matter\n')
+    parsed = []
+    read_card_info = main._read_card_info
+    monkeypatch.setattr(
+        main,
+        '_read_card_info',
+        lambda path: parsed.append(path) or read_card_info(path),
+    )
+
+    for _ in range(3):
+        assert main._sorted_card_paths('docs/cards', workers=0) == ['cards/good.md']
+    assert capsys.readouterr().out.count('Error parsing broken.md') == 1
+    assert parsed.count('cards/broken.md') == 1
+    with pytest.raises(ValueError, match='does not start with YAML front matter'):
+        main.CARD_REGISTRY.get('cards/broken.md')
+    assert parsed.count('cards/broken.md') == 1
+
+    broken.write_text(CARD.format(title='Fixed', date='2025-01-02'))
+    assert main._sorted_card_paths('docs/cards', workers=0)[0] == 'cards/broken.md'
+    assert 'Error parsing' not in capsys.readouterr().out
+
+
+def test_front_matter_reader_stops_at_closing_delimiter(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    card = tmp_path / 'docs' / 'cards' / 'dashes.md'
+    card.parent.mkdir(parents=True)
+    card.write_text(
+        '---\ntitle: Before---after\n---\nBody text\n\n---\n\nMore body\n',
+        encoding='utf-8',
+    )
+
+    metadata, body = main._read_front_matter_from_docs('cards/dashes.md')
+    assert metadata == {'title': 'Before---after'}
+    assert body == 'Body text\n\n---\n\nMore body'
+
+    metadata, body = main._read_front_matter_from_docs(
+        'cards/dashes.md', with_body=False
+    )
+    assert body == ''
+
+    opened = []
+    monkeypatch.setattr(
+        main,
+        'open',
+        lambda *args, **kwargs: opened.append(args) or open(*args, **kwargs),
+        raising=False,
+    )
+    info = main._read_card_info('cards/dashes.md')
+    assert info['description'] == 'Body text\n\n---\n\nMore body'
+    assert len(opened) == 1
+
+
+def test_card_cache_skips_parsing_between_builds(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_card(tmp_path / 'docs', 'one.md', title='Cached')
+    cache_path = str(tmp_path / '.cache' / 'cards.json')
+
+    first = main.CardRegistry(cache=main.CardCache(cache_path))
+    expected = first.get('cards/one.md')
+    first.save()
+
+    def failing_reader(file_path, **kwargs):
+        raise AssertionError(f'{file_path} should have come from the cache')
+
+    monkeypatch.setattr(main, '_read_front_matter_from_docs', failing_reader)
+    profiler = main.BuildProfiler()
+    profiler.enabled = True
+    monkeypatch.setattr(main, 'PROFILER', profiler)
+    second = main.CardRegistry(cache=main.CardCache(cache_path))
+    assert second.get('cards/one.md') == expected
+    assert second.get('cards/one.md') == expected
+    assert profiler.counters == {'card cache hits': 1, 'card registry hits': 1}
+
+
+def test_card_cache_falls_back_on_corrupt_or_stale_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_card(tmp_path / 'docs', 'one.md', title='Fresh')
+    cache_file = tmp_path / 'cards.json'
+
+    cache_file.write_text('{not json', encoding='utf-8')
+    registry = main.CardRegistry(cache=main.CardCache(str(cache_file)))
+    assert registry.get('cards/one.md')['title'] == 'Fresh'
+    registry.save()
+
+    payload = json.loads(cache_file.read_text(encoding='utf-8'))
+    payload['fingerprint'] = 'outdated'
+    payload['cards']['cards/one.md']['info']['title'] = 'Stale'
+    cache_file.write_text(json.dumps(payload), encoding='utf-8')
+    registry = main.CardRegistry(cache=main.CardCache(str(cache_file)))
+    assert registry.get('cards/one.md')['title'] == 'Fresh'
+
+    # Entries of the current fingerprint with missing or unknown fields.
+    registry.save()
+    for corrupt in (
+        lambda info: info.pop('title'),
+        lambda info: info.update(colour='blue'),
+    ):
+        payload = json.loads(cache_file.read_text(encoding='utf-8'))
+        corrupt(payload['cards']['cards/one.md']['info'])
+        cache_file.write_text(json.dumps(payload), encoding='utf-8')
+        registry = main.CardRegistry(cache=main.CardCache(str(cache_file)))
+        assert registry.load_many(['cards/one.md'])[0][1]['title'] == 'Fresh'
+        registry.save()
+
+
+def test_card_cache_fingerprint_covers_normalization_tables(monkeypatch):
+    fingerprint = main._card_cache_fingerprint()
+    sources = {**main.USE_CASE_SOURCES, 'title': ('name',)}
+    for name, value in (
+        ('USE_CASE_SOURCES', sources),
+        ('_STRIPPED_FIELDS', main._STRIPPED_FIELDS[1:]),
+    ):
+        with monkeypatch.context() as patch:
+            patch.setattr(main, name, value)
+            main._card_cache_fingerprint.cache_clear()
+            assert main._card_cache_fingerprint() != fingerprint, name
+        main._card_cache_fingerprint.cache_clear()
+    assert main._card_cache_fingerprint() == fingerprint
+
+
+def test_render_sorted_cards_rerenders_only_changed_cards(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    docs_dir = tmp_path / 'docs'
+    write_card(docs_dir, 'incremental-one.md', title='One')
+    edited = write_card(docs_dir, 'incremental-two.md', title='Two')
+
+    rendered = []
+    original = main._render_grid_use_case_card
+
+    def recording_renderer(file_path, *args):
+        rendered.append(file_path)
+        return original(file_path, *args)
+
+    monkeypatch.setattr(main, '_render_grid_use_case_card', recording_renderer)
+
+    first = main.render_sorted_cards('docs/cards')
+    assert sorted(rendered) == ['cards/incremental-one.md', 'cards/incremental-two.md']
+
+    rendered.clear()
+    assert main.render_sorted_cards('docs/cards') == first
+    assert rendered == []
+
+    edited.write_text(CARD.format(title='Two, edited', date='2025-01-01'))
+    output = main.render_sorted_cards('docs/cards')
+    assert rendered == ['cards/incremental-two.md']
+    assert 'Two, edited' in output
+
+
+def test_parallel_loading_matches_serial_output(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    docs_dir = tmp_path / 'docs'
+    for i in range(6):
+        write_card(
+            docs_dir, f'parallel-{i}.md', title=f'Card {i}', date=f'2025-01-0{i + 1}'
+        )
+    (docs_dir / 'cards' / 'broken.md').write_text('---\ntitle: [unclosed\n---\n')
+
+    serial = main.render_sorted_cards('docs/cards', workers=0)
+    serial_log = capsys.readouterr().out
+
+    monkeypatch.setattr(main, 'CARD_REGISTRY', main.CardRegistry())
+    assert main.render_sorted_cards('docs/cards', workers=2) == serial
+    assert capsys.readouterr().out == serial_log
+    assert serial_log.startswith('Error parsing broken.md: ')
+
+
+def test_write_sorted_cards_streams_the_rendered_gallery(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    docs_dir = tmp_path / 'docs'
+    write_card(docs_dir, 'stream-old.md', title='Older', date='2024-01-01')
+    write_card(docs_dir, 'stream-new.md', title='Newer', date='2025-01-01')
+
+    stream = io.StringIO()
+    main.write_sorted_cards(stream, 'docs/cards', workers=0)
+    assert stream.getvalue() == main.render_sorted_cards('docs/cards', workers=0)
+    assert stream.getvalue().count('<article') == 2  # noqa: PLR2004
+
+
+def test_icon_sprite_mode_references_page_symbols(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    card = write_card(tmp_path / 'docs', 'sprite.md')
+    card.write_text(
+        card.read_text().replace(
+            'keywords:', 'repo_link: https://github.com/x/y\nkeywords:'
+        )
+    )
+
+    inline = main.render_sorted_cards('docs/cards', workers=0)
+    sprite = main.render_sorted_cards('docs/cards', workers=0, icon_sprite=True)
+
+    assert main.INLINE_ICONS['github'] in inline
+    assert '<use href="#icon-github">' in sprite
+    assert main.INLINE_ICONS['github'] not in sprite
+    assert len(sprite) < len(inline)
+    for name in re.findall(r'<use href="#icon-([a-z-]+)">', sprite):
+        assert f'<symbol id="icon-{name}"' in main.ICON_SPRITE
+
+
+GOLDEN = Path(__file__).parent / 'data' / 'golden'
+
+
+def test_card_templates_match_golden_files(tmp_path, monkeypatch):
+    # Regenerate the golden files only for intended markup changes.
+    monkeypatch.chdir(tmp_path)
+    card = tmp_path / 'docs' / 'cards' / 'card.md'
+    card.parent.mkdir(parents=True)
+    card.write_text((GOLDEN / 'card.md').read_text())
+
+    rendered = {
+        'grid-card.html': main._render_grid_use_case_card('cards/card.md', 2),
+        'grid-card-sprite.html': main._render_grid_use_case_card(
+            'cards/card.md', 2, icon_sprite=True
+        ),
+        'rotator-card.html': main._render_featured_rotator_card('cards/card.md', 1),
+    }
+
+    for name, html in rendered.items():
+        assert html == (GOLDEN / name).read_text(), name
+
+
+def test_shards_split_the_sorted_gallery(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for i in range(5):
+        write_card(tmp_path / 'docs', f'shard-{i}.md', date=f'"2025-01-0{i + 1}"')
+
+    shards = main.shard_sorted_cards('docs/cards', shard_size=2, workers=0)
+
+    assert [shard.count('<article') for shard in shards] == [2, 2, 1]
+    assert ''.join(shards) == main.render_sorted_cards('docs/cards', workers=0)
+    assert 'shard-4' in shards[0]  # newest first
+
+
+def test_search_index_matches_the_rendered_cards(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    docs_dir = tmp_path / 'docs'
+    write_card(docs_dir, 'index-old.md', date='"2024-01-01"')
+    card = write_card(docs_dir, 'index-new.md', date='"2025-01-01"')
+    card.write_text(card.read_text().replace('- Beta', '- Gamma'))
+
+    index = main.build_search_index('docs/cards', workers=0)
+    html = main.render_sorted_cards('docs/cards', workers=0)
+
+    assert index['count'] == 2  # noqa: PLR2004
+    assert index['cards']['ids'] == re.findall(r'id="(grid-card-[^"]+)"', html)
+    assert index['cards']['ids'][0] == 'grid-card-index-new'
+    assert index['keywords'] == ['Alpha', 'Beta', 'Gamma']
+    assert index['postings'] == [[0, 1], [1], [0]]
+    for field in main.SEARCH_INDEX_FIELDS:
+        values = [index['fields'][field][code] for code in index['cards'][field]]
+        attribute = 'data-' + field.replace('_', '-')
+        assert values == re.findall(rf'{attribute}="([^"]*)"', html)
+
+
+def test_facets_merge_spellings_and_count_cooccurrence(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    docs_dir = tmp_path / 'docs'
+    write_card(docs_dir, 'facet-1.md', date='"2025-01-03"')
+    card = write_card(docs_dir, 'facet-2.md', date='"2025-01-02"')
+    card.write_text(card.read_text().replace('- Beta', '- alpha\n  - Gamma'))
+    card = write_card(docs_dir, 'facet-3.md', date='"2025-01-01"')
+    card.write_text(card.read_text().replace('- Beta', '- " beta "'))
+
+    facets = main.build_facets('docs/cards', workers=0)
+
+    assert facets['count'] == 3  # noqa: PLR2004
+    keywords = facets['facets']['keywords']
+    # 'alpha' only repeats a keyword of its own card; ' beta ' is merged too.
+    assert keywords == {'values': ['Alpha', 'Beta', 'Gamma'], 'counts': [3, 2, 1]}
+    assert facets['related'] == [[[1, 2], [2, 1]], [[0, 2]], [[0, 1]]]
+    assert facets['facets']['methodology'] == {'values': [], 'counts': []}
+
+    monkeypatch.setattr(main, 'FACET_RELATED_LIMIT', 1)
+    facets = main.build_facets('docs/cards', workers=0)
+    assert facets['related'] == [[[1, 2]], [[0, 2]], [[0, 1]]]
+
+
+def test_profiler_times_stages_and_restores_functions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_card(tmp_path / 'docs', 'profiled.md')
+    profiler = main.BuildProfiler()
+    monkeypatch.setattr(main, 'PROFILER', profiler)
+    original_esc = main.esc
+
+    profiler.enable(vars(main), str(tmp_path / 'out' / 'profile.json'))
+    try:
+        main.render_sorted_cards('docs/cards', workers=0)
+        main.CARD_REGISTRY.get('cards/profiled.md')
+        profiler.write(profiler.output)
+    finally:
+        profiler.disable()
+
+    assert main.esc is original_esc
+    assert profiler.stages['load card'][0] == 1
+    assert profiler.stages['parse YAML'][0] == 1
+    calls, total, own = profiler.stages['render grid card']
+    assert calls == 1
+    assert 0 <= own <= total
+    assert profiler.counters['card registry hits'] >= 1
+    assert [card for card, _ in profiler.slowest_cards()] == ['cards/profiled.md']
+    assert 'escape HTML' in profiler.report()
+
+    profile = json.loads((tmp_path / 'out' / 'profile.json').read_text())
+    assert {event['name'] for event in profile['traceEvents']} >= {
+        'load card',
+        'render grid card',
+    }
+
+
+def test_card_index_follows_edits_like_a_full_render(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    docs_dir = tmp_path / 'docs'
+    for i in range(6):
+        write_card(docs_dir, f'watched-{i}.md', date=f'"2025-01-0{i + 1}"')
+    index = main.CardIndex('docs/cards').load(workers=0)
+
+    def rendered():
+        return ''.join(card + '\n' for card in index.cards())
+
+    assert rendered() == main.render_sorted_cards('docs/cards', workers=0)
+
+    # Move the oldest card to the top, add one and delete one.
+    write_card(docs_dir, 'watched-0.md', title='Moved', date='"2025-02-01"')
+    write_card(docs_dir, 'watched-new.md', date='"2025-01-04"')
+    (docs_dir / 'cards' / 'watched-5.md').unlink()
+    changes = main.queue.Queue()
+    for name in ('watched-0.md', 'watched-new.md', 'watched-5.md', '../other.md'):
+        changes.put(str(docs_dir / 'cards' / name))
+
+    assert main._apply_card_changes(index, changes) == 4  # noqa: PLR2004
+    assert index.paths()[:2] == ['cards/watched-0.md', 'cards/watched-4.md']
+    assert 'cards/watched-5.md' not in index.paths()
+    assert rendered() == main.render_sorted_cards('docs/cards', workers=0)
+
+    # Edits watchdog did not report are found by their file signature.
+    assert main._apply_card_changes(index, changes) == 0
+    write_card(docs_dir, 'watched-1.md', title='Unreported', date='"2025-03-01"')
+    assert main._apply_card_changes(index, changes) == 1
+    assert index.paths()[0] == 'cards/watched-1.md'
+    assert rendered() == main.render_sorted_cards('docs/cards', workers=0)
+
+
+def test_card_index_fills_gradients_by_position(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    docs_dir = tmp_path / 'docs'
+    for i in range(3):
+        write_card(docs_dir, f'gradient-{i}.md', date=f'"2025-01-0{i + 1}"')
+    # A card that mentions a gradient in its text keeps it.
+    card = docs_dir / 'cards' / 'gradient-0.md'
+    card.write_text(
+        card.read_text().replace('A synthetic card.', f'"{main.CARD_GRADIENTS[0]}"')
+    )
+    index = main.CardIndex('docs/cards').load(workers=0)
+
+    write_card(docs_dir, 'gradient-new.md', date='"2025-02-01"')
+    index.update('cards/gradient-new.md')
+
+    cards = index.cards()
+    assert index.paths()[0] == 'cards/gradient-new.md'
+    for i, card in enumerate(cards):
+        gradient = main.CARD_GRADIENTS[i % len(main.CARD_GRADIENTS)]
+        assert card.count(f'gradient: {gradient};') == 1
+        assert card.count(f'background: {gradient};') == 1
+        assert main.GRADIENT_SLOT not in card
+    assert f'collapsed">{main.CARD_GRADIENTS[0]}</p>' in cards[-1]
+    assert ''.join(card + '\n' for card in cards) == main.render_sorted_cards(
+        'docs/cards', workers=0
+    )
+
+
+def test_use_case_info_fields_match_gallery_entry():
+    quantities = main._gallery_entry_quantities()
+    for field, keys in main.USE_CASE_SOURCES.items():
+        for key in keys:
+            quantity = main.CARD_FIELD_ALIASES.get(key, key)
+            assert quantity in quantities or key in main.CARD_ONLY_FIELDS, field
+
+    info = main._normalize_use_case_info({'title': 'A & B', 'keywords': 'x, y'})
+    assert info.as_dict().keys() == set(main.USE_CASE_FIELDS)
+    assert info['keywords'] == info.keywords == ['x', 'y']
+    assert info.escaped('title') == 'A &amp; B'
+    assert not hasattr(info, '__dict__')
+    assert main.UseCaseInfo.from_dict(info.as_dict()) == info
+
+
+def test_prebuilt_fragments_match_rendering_until_cards_change(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    docs_dir = tmp_path / 'docs'
+    for i in range(3):
+        write_card(docs_dir, f'prebuilt-{i}.md', date=f'"2025-01-0{i + 1}"')
+    store = main.FragmentStore(str(tmp_path / 'fragments'))
+
+    assert main.build_grid_fragment(store, 'docs/cards', workers=0)
+    assert main.build_rotator_fragment(store, 'cards/prebuilt-0.md', index=1)
+    assert not main.build_grid_fragment(store, 'docs/cards', 0, changed_only=True)
+    store.save()
+
+    store = main.FragmentStore(str(tmp_path / 'fragments'))
+    pieces = main.prebuilt_sorted_cards(store, 'docs/cards')
+    assert ''.join(pieces) == main.render_sorted_cards('docs/cards', workers=0)
+    assert main.shard_sorted_cards('docs/cards', 2, workers=0) == (
+        main._split_into_shards(pieces, 2)
+    )
+    assert main.prebuilt_sorted_cards(store, 'docs/cards', icon_sprite=True) is None
+
+    write_card(docs_dir, 'prebuilt-3.md', date='"2025-01-04"')
+    assert main.prebuilt_sorted_cards(store, 'docs/cards') is None
+
+
+def test_validate_cards_reports_schema_violations(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    docs_dir = tmp_path / 'docs'
+    write_card(docs_dir, 'valid.md')
+    misspelled = write_card(docs_dir, 'misspelled.md')
+    misspelled.write_text(
+        misspelled.read_text().replace(
+            'keywords:', 'methodology_type: Hybrid\nkeywords:'
+        )
+    )
+    alias = write_card(docs_dir, 'alias.md')
+    alias.write_text(alias.read_text().replace('submission_date:', 'submitted_date:'))
+    undated = write_card(docs_dir, 'undated.md')
+    undated.write_text(undated.read_text().replace('submission_date:', 'notes:'))
+    invalid = write_card(docs_dir, 'invalid.md', date='"2025-02-30"')
+    invalid.write_text(
+        invalid.read_text().replace(
+            'keywords:',
+            'methodology_type: Theory\ndownloads: many\nmedia_url: ftp://x\n'
+            'estimated_active_users: "1,000"\nkeywords:',
+        )
+    )
+
+    paths = ['cards/valid.md', 'cards/misspelled.md', 'cards/invalid.md']
+    results = dict(main.validate_cards(paths))
+    assert results['cards/valid.md'] == []
+    assert main.validate_card('cards/alias.md') == []
+    assert ('error', 'submission_date', 'required field is missing') in (
+        main.validate_card('cards/undated.md')
+    )
+    assert results['cards/misspelled.md'] == [
+        ('warning', 'methodology_type', "'Hybrid' should be spelled 'Mixed/Hybrid'")
+    ]
+    assert {(s, f) for s, f, _ in results['cards/invalid.md']} == {
+        ('error', 'submission_date'),
+        ('error', 'methodology_type'),
+        ('error', 'downloads'),
+        ('error', 'media_url'),
+        ('warning', 'estimated_active_users'),
+    }
+
+    report = tmp_path / 'report.json'
+    exit_code = main.validate_cards_command(['--jobs', '0', '--json', str(report)])
+    assert exit_code == 1
+    assert json.loads(report.read_text())['errors'] == 5  # noqa: PLR2004
+
+
+def test_yaml_dates_sort_newest_first(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    docs_dir = tmp_path / 'docs'
+    write_card(docs_dir, 'a-undated.md', date='"soon"')
+    write_card(docs_dir, 'b-old.md', date='2023-05-01')
+    write_card(docs_dir, 'c-new.md', date='"2025-01-01"')
+    write_card(docs_dir, 'd-mid.md', date='2024-06-30')
+
+    assert main._sorted_card_paths('docs/cards', workers=0) == [
+        'cards/c-new.md',
+        'cards/d-mid.md',
+        'cards/b-old.md',
+        'cards/a-undated.md',
+    ]
+
+
+def test_select_top_cards_ranks_by_date_or_metric(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    docs_dir = tmp_path / 'docs'
+    for name, date, downloads in [
+        ('a.md', '2023-01-01', 500),
+        ('b.md', '2025-01-01', 'many'),
+        ('c.md', '2024-01-01', 10),
+        ('d.md', '2022-01-01', 500),
+    ]:
+        card = write_card(docs_dir, name, date=date)
+        card.write_text(
+            card.read_text().replace('keywords:', f'downloads: {downloads}\nkeywords:')
+        )
+
+    sorted_paths = main._sorted_card_paths('docs/cards', workers=0)
+    assert main.select_top_cards('docs/cards', k=2) == sorted_paths[:2]
+    assert main.select_top_cards('docs/cards', k=3, by='downloads') == [
+        'cards/a.md',
+        'cards/d.md',
+        'cards/c.md',
+    ]
+
+    # Pinned cards come first; a pinned copy of a card is not shown twice.
+    for name in ('b.md', 'z.md'):
+        write_card(docs_dir / 'pinned', name)
+    assert main.featured_card_paths('docs/cards', 3, pinned='docs/pinned/cards') == [
+        'pinned/cards/b.md',
+        'pinned/cards/z.md',
+        'cards/c.md',
+    ]
+    page = tmp_path / 'index.md'
+    page.write_text(
+        '{{ render_featured_rotator_slides("docs/cards", k=3, by="newest", '
+        'pinned="docs/pinned/cards") }}'
+    )
+    assert main._featured_rotator_cards(str(page)) == [
+        ('pinned/cards/b.md', 0),
+        ('pinned/cards/z.md', 1),
+        ('cards/c.md', 2),
+    ]
+
+
+def test_image_cache_serves_local_copies_and_works_offline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    remote = tmp_path / 'remote'
+    remote.mkdir()
+    (remote / 'hero.png').write_bytes(PNG)
+    handler = functools.partial(
+        http.server.SimpleHTTPRequestHandler, directory=str(remote)
+    )
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/hero.png'
+
+    card = write_card(tmp_path / 'docs', 'image.md')
+    card.write_text(
+        card.read_text().replace('keywords:', f'image_path: {url}\nkeywords:')
+    )
+    monkeypatch.setattr(main, 'GENERATED_FILES', {})
+    monkeypatch.setattr(
+        main, 'CARD_IMAGES', main.ImageCache(str(tmp_path / 'images'), enabled=True)
+    )
+    online = main.render_sorted_cards('docs/cards', workers=0)
+    main.CARD_IMAGES.save()
+    server.shutdown()
+    server.server_close()
+
+    (src,) = re.findall(r'<img src="([^"]+)"', online)
+    assert src.startswith(main.IMAGE_SITE_DIR + '/')
+    assert 'loading="lazy"' in online
+    assert main.GENERATED_FILES[src].read_bytes()
+    if main.Image is not None:
+        assert src.endswith('.webp')
+        assert 'width="40" height="20"' in online
+
+    # The server is gone; the cached copy is used.
+    monkeypatch.setattr(
+        main, 'CARD_IMAGES', main.ImageCache(str(tmp_path / 'images'), enabled=True)
+    )
+    assert main._render_grid_use_case_card('cards/image.md') in online
+    assert main.CARD_IMAGES.prune(main.GENERATED_FILES.values()) == 0
+
+    # Images no longer published by a build are dropped from the cache.
+    card.write_text(CARD.format(title='Without image', date='2025-01-01'))
+    main.GENERATED_FILES.clear()
+    main.render_sorted_cards('docs/cards', workers=0)
+    removed = main.CARD_IMAGES.prune(main.GENERATED_FILES.values())
+    main.CARD_IMAGES.save()
+    assert removed == (1 if main.Image is None else 2)
+    files = [path.name for path in (tmp_path / 'images').rglob('*') if path.is_file()]
+    assert files == ['index.json']
+    index = json.loads((tmp_path / 'images' / 'index.json').read_text())
+    assert index == {'sources': {}, 'images': {}}
+
+
+def test_compress_site_writes_siblings_and_skips_unchanged_files(tmp_path, capsys):
+    site = tmp_path / 'site'
+    (site / 'gallery-index').mkdir(parents=True)
+    page = site / 'index.html'
+    page.write_text(main.ICON_SPRITE * 20)
+    (site / 'gallery-index' / 'cards.json').write_text('[1, 2, 3]' * 200)
+    (site / 'small.html').write_text('<p>tiny</p>')
+    cache = tmp_path / 'cache'
+
+    first = main.compress_site(site, workers=2, cache_dir=cache)
+
+    assert (first['files'], first['changed']) == (2, 2)
+    assert gzip.decompress((site / 'index.html.gz').read_bytes()) == page.read_bytes()
+    assert not (site / 'small.html.gz').exists()
+    for suffix, size in first['compressed'].items():
+        assert size < first['size'] / 5, suffix
+    assert 'Compressed 2 site files (2 changed)' in capsys.readouterr().out
+
+    # A clean rebuild: unchanged files come from the cache.
+    (site / 'index.html.gz').unlink()
+    page.write_text(page.read_text() + '<p>edited</p>')
+    second = main.compress_site(site, workers=2, cache_dir=cache)
+
+    assert (second['files'], second['changed']) == (2, 1)
+    assert gzip.decompress((site / 'index.html.gz').read_bytes()) == page.read_bytes()
+    # The siblings of the page before the edit are dropped from the cache.
+    assert second['pruned'] == len(second['compressed'])
+    assert len(list(cache.rglob('*.gz'))) == 2  # noqa: PLR2004
+
+
+def test_image_cache_only_publishes_images_inside_docs(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'secret.env').write_text('TOKEN=hunter2')
+    (tmp_path / 'docs' / 'assets').mkdir(parents=True)
+    (tmp_path / 'docs' / 'assets' / 'notes.png').write_text('not an image')
+    (tmp_path / 'docs' / 'assets' / 'hero.png').write_bytes(PNG)
+    monkeypatch.setattr(main, 'GENERATED_FILES', {})
+
+    for pillow in (main.Image, None):
+        monkeypatch.setattr(main, 'Image', pillow)
+        cache = main.ImageCache(str(tmp_path / 'images'), enabled=True)
+        for source in (
+            '../secret.env',
+            'assets/../../secret.env',
+            f'file://{tmp_path}/secret.env',
+            'assets/notes.png',
+        ):
+            assert cache.resolve(source) is None, source
+        assert main.GENERATED_FILES == {}
+        assert cache.resolve('assets/hero.png') is not None
+        main.GENERATED_FILES.clear()
+
+    assert 'must stay inside docs/' in capsys.readouterr().out
+    for path in (tmp_path / 'images').rglob('*'):
+        assert b'hunter2' not in (path.read_bytes() if path.is_file() else b'')
+
+
+def test_split_card_details_moves_the_expanded_section_out(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_card(tmp_path / 'docs', 'lazy.md')
+    card = main.render_sorted_cards('docs/cards', workers=0)
+
+    collapsed, details = main.split_card_details(card, lambda slug: f'd/{slug}.html')
+
+    assert 'data-details-url="d/lazy.html"></div>' in collapsed
+    assert 'grid-use-case-card__expanded-grid' in details
+    assert 'expanded-grid' not in collapsed
+    assert collapsed.replace(' data-details-url="d/lazy.html">', '>' + details) == card
+    assert main.split_card_details('**Error**', str) == ('**Error**', None)
+
+
+class MacroEnv:
+    """The parts of the mkdocs-macros env used by ``main.define_env``."""
+
+    def __init__(self, extra):
+        self.conf = {'extra': extra}
+        self.macros = {}
+        self.page = type('Page', (), {'url': 'explore.html'})()
+
+    def macro(self, function, name=None):
+        self.macros[name or function.__name__] = function
+        return function
+
+
+def test_lazy_details_of_cards_dirs_do_not_collide(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_card(tmp_path / 'docs', 'same.md', title='First')
+    write_card(tmp_path / 'docs' / 'more', 'same.md', title='Second')
+    env = MacroEnv({'gallery_lazy_details': True})
+    main.define_env(env)
+
+    try:
+        render = env.macros['render_sorted_cards_macro']
+        pages = [render(cards_dir) for cards_dir in ('docs/cards', 'docs/more/cards')]
+        details = dict(main.GENERATED_FILES)
+    finally:
+        main.GENERATED_FILES.clear()
+
+    assert set(details) == {
+        'gallery-details/docs-cards/same.html',
+        'gallery-details/docs-more-cards/same.html',
+    }
+    for page, path in zip(pages, details):
+        assert f'data-details-url="{path}"' in page
+
+
+def test_import_archives_writes_cards_idempotently(tmp_path, monkeypatch):
+    archives = tmp_path / 'archives'
+    archives.mkdir()
+    (archives / 'test.archive.yaml').write_text(
+        (Path(__file__).parent / 'data' / 'test.archive.yaml').read_text()
+    )
+    archive = {
+        'metadata': {'entry_id': 'abc', 'entry_create_time': '2024-03-01T10:00:00'},
+        'data': {
+            'm_def': 'nomad_gallery.schema_packages.schema_package.GalleryEntry',
+            'name': 'From JSON',
+            'keywords': ['A', 'B'],
+            'downloads': 7,
+            'methodology_type': ' mixed ',
+        },
+    }
+    (archives / 'abc.archive.json').write_text(json.dumps(archive))
+    (archives / 'other.archive.json').write_text('{"data": {"m_def": "Other"}}')
+    monkeypatch.chdir(tmp_path)
+
+    first = dict(main.import_archives(['archives']))
+    assert first == {
+        'archives/abc.archive.json': 'new',
+        'archives/other.archive.json': 'not a GalleryEntry archive',
+        'archives/test.archive.yaml': 'new',
+    }
+    info = main.CARD_REGISTRY.get('cards/archive-abc.md')
+    assert info == main._read_card_info('cards/archive-abc.md')
+    assert info['title'] == 'From JSON'
+    assert info['submission_date'] == '2024-03-01'
+    assert info['methodology'] == 'Mixed/Hybrid'
+    assert main.validate_card('cards/archive-test.md') == []
+
+    second = dict(main.import_archives(['archives'], workers=2))
+    assert second['archives/abc.archive.json'] == 'unchanged'
+    assert second['archives/test.archive.yaml'] == 'unchanged'
+
+    archive['data']['downloads'] = 8
+    (archives / 'abc.archive.json').write_text(json.dumps(archive))
+    third = dict(main.import_archives(['archives']))
+    assert third['archives/abc.archive.json'] == 'updated'
+    assert main.CARD_REGISTRY.get('cards/archive-abc.md')['downloads'] == 8  # noqa: PLR2004
+
+
+def test_import_archives_reports_malformed_archives(tmp_path, monkeypatch):
+    archives = tmp_path / 'archives'
+    archives.mkdir()
+    entry = {'m_def': 'nomad_gallery.schema_packages.schema_package.GalleryEntry'}
+    for name, archive in (
+        ('good', {'data': {**entry, 'name': 'Good'}}),
+        ('list', [entry]),
+        ('data', {'data': 'GalleryEntry'}),
+        ('metadata', {'metadata': ['abc'], 'data': {**entry, 'name': 'Bad'}}),
+    ):
+        (archives / f'{name}.archive.json').write_text(json.dumps(archive))
+    monkeypatch.chdir(tmp_path)
+
+    assert dict(main.import_archives(['archives'])) == {
+        'archives/data.archive.json': 'data is not a mapping',
+        'archives/good.archive.json': 'new',
+        'archives/list.archive.json': 'archive is not a mapping',
+        'archives/metadata.archive.json': 'metadata is not a mapping',
+    }